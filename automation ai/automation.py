@@ -5,16 +5,20 @@ linkedin_easy_apply_state_machine.py
 A robust, state-machine–driven LinkedIn Easy Apply bot using Playwright + OpenAI.
 """
 
+import atexit
 import os
 import sys
 import time
 import random
+import re
 import logging
 import csv
 from datetime import datetime
+from urllib.parse import quote, urlencode
 
 from dotenv import load_dotenv
-import openai
+import httpx
+from openai import OpenAI
 from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
 from docx import Document
 
@@ -29,6 +33,8 @@ RESUME_PATH = os.getenv("RESUME_PATH")
 OPENAI_KEY  = os.getenv("OPENAI_API_KEY")
 MAX_APPLIES = int(os.getenv("MAX_APPLIES", "5"))
 CSV_PATH    = os.getenv("CSV_PATH", "applications.csv")
+STORAGE_STATE_PATH = os.getenv("STORAGE_STATE_PATH", "li_state.json")
+JOB_KEYWORDS = os.getenv("JOB_KEYWORDS", "Software Engineer Intern")
 
 print("ENV CHECK:")
 print("EMAIL:", EMAIL)
@@ -47,13 +53,16 @@ if not OPENAI_KEY:
 if not os.path.isfile(RESUME_PATH):
     raise FileNotFoundError(f"Resume not found at {RESUME_PATH}")
 
-openai.api_key = OPENAI_KEY
+# One client (and one HTTP/2 keep-alive pool) for every GPT call in the run
+http_client = httpx.Client(http2=True, timeout=30)
+client = OpenAI(api_key=OPENAI_KEY, http_client=http_client)
+atexit.register(http_client.close)
 
 # ─── HELPER: VERIFY OPENAI STATUS ────────────────────────────────────────────────
 def verify_openai():
     try:
-        resp = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
             messages=[{"role": "user", "content": "Say 'ready' if you're working."}]
         )
         answer = resp.choices[0].message.content.strip().lower()
@@ -75,7 +84,7 @@ def load_resume_text(path: str) -> str:
                 prefix = "- " if para.style.name.lower().startswith("list") else ""
                 lines.append(f"{prefix}{para.text.strip()}")
         result = "\n".join(lines)
-        print("📄 RESUME PREVIEW:", result[:500], "...\n")
+        print(f"📄 Loaded resume ({len(result)} characters)")
         return result
     except Exception as e:
         print(f"Failed to read resume: {e}")
@@ -83,6 +92,11 @@ def load_resume_text(path: str) -> str:
 
 RESUME_TEXT = load_resume_text(RESUME_PATH)
 
+PROMPT_PREFIX = (
+    f"You are applying for a {JOB_KEYWORDS} position.\n"
+    f"Use my resume below to answer job application questions.\n\n{RESUME_TEXT}\n"
+)
+
 ANSWER_MAP = {
     "legally authorized to work": "Yes",
     "require sponsorship":       "No",
@@ -90,6 +104,8 @@ ANSWER_MAP = {
     "minimum salary":            "0",
     "start date":                "Immediately",
 }
+# One precompiled alternation instead of a substring scan per key; longest keys first so overlaps pick the specific one
+ANSWER_RE = re.compile("|".join(re.escape(k) for k in sorted(ANSWER_MAP, key=len, reverse=True)))
 
 def human_pause(a=0.8, b=1.5):
     time.sleep(random.uniform(a, b))
@@ -97,12 +113,12 @@ def human_pause(a=0.8, b=1.5):
 def answer_text(q: str) -> str:
     try:
         print(f"\n[AI] Answering TEXT Q: {q}")
-        resp = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo", temperature=0.5, max_tokens=80,
-            messages=[{"role": "user", "content":
-                f"You are applying for a Software Engineer Intern.\n"
-                f"Use my resume to answer concisely:\n\n{RESUME_TEXT}\n\nQuestion: {q}\nAnswer:"
-            }]
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini", temperature=0.5, max_tokens=60,
+            messages=[
+                {"role": "system", "content": PROMPT_PREFIX},
+                {"role": "user", "content": f"Answer concisely.\nQuestion: {q}\nAnswer:"}
+            ]
         )
         answer = resp.choices[0].message.content.strip()
         print(f"[AI] TEXT Answer: {answer}")
@@ -115,13 +131,14 @@ def answer_text(q: str) -> str:
 def answer_select(q: str, options: list[str]) -> str:
     try:
         print(f"\n[AI] Answering SELECT Q: {q}\nOptions: {options}")
-        resp = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo", temperature=0.3, max_tokens=40,
-            messages=[{"role": "user", "content":
-                f"You are applying for a Software Engineer Intern.\n"
-                f"Use my resume to choose the best option:\n\n{RESUME_TEXT}\n\n"
-                f"Question: {q}\nOptions:\n" + "\n".join(f"- {o}" for o in options) + "\nReply exactly with the best option."
-            }]
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini", temperature=0.3, max_tokens=40,
+            messages=[
+                {"role": "system", "content": PROMPT_PREFIX},
+                {"role": "user", "content":
+                    f"Choose the best option.\nQuestion: {q}\nOptions:\n" + "\n".join(f"- {o}" for o in options) + "\nReply exactly with the best option."
+                }
+            ]
         )
         answer = resp.choices[0].message.content.strip()
         print(f"[AI] SELECT Answer: {answer}")
@@ -131,9 +148,27 @@ def answer_select(q: str, options: list[str]) -> str:
         print(f"[AI] SELECT Answer ERROR: {e}")
         return options[0] if options else ""
 
+def open_jobs_search(page):
+    logging.info("▶ Loading Easy Apply jobs…")
+    for _ in range(3):
+        try:
+            page.goto(JOBS_URL, wait_until="domcontentloaded", timeout=10000)
+            return
+        except PWTimeout:
+            if page.locator(JOB_CARD).first.is_visible():
+                return
+            logging.warning("Retrying navigation…")
+
+def close_modal(page, modal):
+    cancel = modal.locator("button:has-text('Cancel'), button:has-text('Dismiss')")
+    if cancel.count():
+        cancel.first.click()
+    else:
+        page.keyboard.press("Escape")
+
 # ─── SELECTORS & URLS ───────────────────────────────────────────────────────────
 LOGIN_URL = "https://www.linkedin.com/login"
-JOBS_URL  = "https://www.linkedin.com/jobs/search/?f_AL=true&keywords=Software%20Engineer%20Intern"
+JOBS_URL  = "https://www.linkedin.com/jobs/search/?" + urlencode({"f_AL": "true", "keywords": JOB_KEYWORDS}, quote_via=quote)
 
 JOB_CARD   = "li[data-occludable-job-id], li.job-card-container--clickable"
 APPLY_BTN  = "button[data-control-name='jobdetails_topcard_inapply']"
@@ -142,6 +177,74 @@ REVIEW_BTN = "button:has-text('Review')"
 SUBMIT_BTN = "button:has-text('Submit')"
 NOT_NOW    = "button:has-text('Not now')"
 
+# Scrolls the last card into view until `target` cards exist or a scroll adds none; returns the card count
+LOAD_CARDS_JS = """
+async ([sel, target]) => {
+    let last = 0;
+    for (let i = 0; i < 20; i++) {
+        const cards = document.querySelectorAll(sel);
+        if (cards.length >= target || cards.length === last) break;
+        last = cards.length;
+        cards[cards.length - 1].scrollIntoView({block: "end"});
+        await new Promise(r => setTimeout(r, 400));
+    }
+    return document.querySelectorAll(sel).length;
+}
+"""
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+def block_heavy_resources(route):
+    # stylesheets stay: visibility checks need real layout
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+CARD_META_JS = """
+([sel, total]) => [...document.querySelectorAll(sel)].slice(0, total).map(card => ({
+    title: card.querySelector("h3")?.innerText.trim() ?? "company title hidden",
+    company: card.querySelector("h4")?.innerText.trim() ?? "company name hidden",
+    link: card.querySelector("a[href*='/jobs/view/']")?.getAttribute("href") ?? null,
+    id: card.getAttribute("data-occludable-job-id")
+        ?? card.querySelector("a[href*='/jobs/view/']")?.getAttribute("href").match(/\/jobs\/view\/(\d+)/)?.[1]
+        ?? null,
+}))
+"""
+
+# True once the details pane shows job `id` (its job link, or the URL while the pane has no link yet)
+JOB_SHOWN_JS = """
+(id) => {
+    const pane = document.querySelector(".jobs-search__job-details--wrapper, .jobs-details, .scaffold-layout__detail");
+    const link = pane?.querySelector("a[href*='/jobs/view/']");
+    if (link) return link.getAttribute("href").includes(`/jobs/view/${id}`);
+    return new URL(location.href).searchParams.get("currentJobId") === id;
+}
+"""
+
+MODAL_STATE_JS = """
+(modal) => ({
+    header: (modal.querySelector("h2, h3")?.innerText || "").trim(),
+    buttons: [...modal.querySelectorAll("button")].map(b => b.innerText.trim()).filter(Boolean).slice(0, 5).join("|"),
+})
+"""
+
+# True once the modal is gone or its header::buttons key differs from `prev`
+MODAL_CHANGED_JS = f"""
+([modal, prev]) => {{
+    if (!modal.isConnected) return true;
+    const s = ({MODAL_STATE_JS.strip()})(modal);
+    return `${{s.header}}::${{s.buttons}}` !== prev;
+}}
+"""
+
+def wait_for_modal_change(page, modal, prev_key, timeout_ms=5000):
+    # returns as soon as the click has moved the modal on; an unchanged modal is left to the stuck guard
+    try:
+        page.wait_for_function(MODAL_CHANGED_JS, arg=[modal.element_handle(timeout=1000), prev_key], timeout=timeout_ms)
+    except Exception:
+        pass
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
 # ─── MAIN ────────────────────────────────────────────────────────────────────────
@@ -153,227 +256,240 @@ def main():
 
     with sync_playwright() as pw:
         browser = pw.chromium.launch(headless=False)
-        page    = browser.new_page()
-
-        logging.info("▶ Logging into LinkedIn…")
-        page.goto(LOGIN_URL)
-        page.fill("input#username", EMAIL)
-        page.fill("input#password", PASSWORD)
-        page.click("button[type='submit']")
-        try:
-            page.wait_for_url("**/feed/**", timeout=10000)
-        except PWTimeout:
-            input("🔒 Complete LinkedIn checkpoint, then press ENTER…")
-        page.wait_for_selector("div.feed-outlet", timeout=60000)
-        logging.info("✅ Logged in.")
-
-        logging.info("▶ Loading Easy Apply jobs…")
-        for _ in range(3):
+        # Reuse the session saved by an earlier run so warm starts skip the login form
+        has_state = os.path.isfile(STORAGE_STATE_PATH)
+        context = browser.new_context(storage_state=STORAGE_STATE_PATH if has_state else None)
+        context.route("**/*", block_heavy_resources)
+        page    = context.new_page()
+        page.set_default_timeout(5000)
+
+        logged_in = False
+        if has_state:
+            logging.info("▶ Reusing saved LinkedIn session…")
+            open_jobs_search(page)
+            # a timed-out goto leaves about:blank behind, so require that we actually reached the jobs search
+            logged_in = "/jobs" in page.url and not any(
+                part in page.url for part in ["/login", "/authwall", "/checkpoint", "/uas/"]
+            )
+
+        if not logged_in:
+            logging.info("▶ Logging into LinkedIn…")
+            page.goto(LOGIN_URL, wait_until="domcontentloaded", timeout=15000)
+            page.fill("input#username", EMAIL)
+            page.fill("input#password", PASSWORD)
+            page.click("button[type='submit']")
             try:
-                page.goto(JOBS_URL, timeout=10000)
-                break
+                page.wait_for_url("**/feed/**", wait_until="domcontentloaded", timeout=10000)
             except PWTimeout:
-                logging.warning("Retrying navigation…")
-        page.wait_for_selector(JOB_CARD, timeout=30000)
-
-        # Scroll until we have enough
-        prev = 0
-        while True:
-            cards = page.locator(JOB_CARD)
-            count = cards.count()
-            if count >= MAX_APPLIES or count == prev:
-                break
-            prev = count
-            cards.nth(count - 1).scroll_into_view_if_needed()
-            human_pause(0.4, 0.9)
+                input("🔒 Complete LinkedIn checkpoint, then press ENTER…")
+            page.wait_for_selector("div.feed-outlet", timeout=60000)
+            context.storage_state(path=STORAGE_STATE_PATH)
+            logging.info("✅ Logged in.")
+            open_jobs_search(page)
+
+        page.wait_for_selector(JOB_CARD, timeout=15000)
+
+        # Scroll until we have enough, entirely inside the page
+        count = page.evaluate(LOAD_CARDS_JS, [JOB_CARD, MAX_APPLIES])
         total = min(count, MAX_APPLIES)
         logging.info(f"✅ Found {count} jobs; will apply to first {total}.")
 
-        for i in range(total):
-            card = page.locator(JOB_CARD).nth(i)
-            # extract title & company
-            title_el   = card.locator("h3")
-            company_el = card.locator("h4")
-            title      = title_el.first.inner_text().strip() if title_el.count() else "company title hidden"
-            company    = company_el.first.inner_text().strip() if company_el.count() else "company name hidden"
-            link = card.locator("a[href*='/jobs/view/']").first.get_attribute("href")
-            card.click()
-            human_pause(0.8, 1.5)
-
-            # click Easy Apply
-            try:
-                page.wait_for_selector(APPLY_BTN, timeout=10000)
-                page.locator(APPLY_BTN).click()
-            except PWTimeout:
-                btn = page.get_by_role("button", name="Easy Apply")
-                if btn.is_visible():
-                    btn.click()
-                else:
-                    logging.warning(f"'{title}' has no Easy Apply")
+        # extract title, company & link for every card in one round trip
+        metas = page.evaluate(CARD_META_JS, [JOB_CARD, total])
+
+        # write each record as soon as it's done so a crash keeps earlier progress
+        fieldnames = ["Title", "Company", "Link", "DateApplied", "Runtime"]
+        exists = os.path.isfile(CSV_PATH)
+        csv_f = open(CSV_PATH, "a", newline="", encoding="utf-8", buffering=1)
+        try:
+            writer = csv.DictWriter(csv_f, fieldnames=fieldnames)
+            if not exists:
+                writer.writeheader()
+            for i, meta in enumerate(metas):
+                title, company, link = meta["title"], meta["company"], meta["link"]
+                if not meta["id"]:
+                    logging.warning(f"'{title}' has no job id, skipping")
                     continue
-            human_pause(1, 2)
-
-            # application modal
-            page.wait_for_selector("div[role='dialog']", timeout=15000)
-            modal = page.locator("div[role='dialog']").first
-
-            start = time.monotonic()
-            while True:
-                hdr = modal.locator("h2, h3")
-                txt = hdr.first.inner_text().strip().lower() if hdr.count() else ""
-
-                if any(k in txt for k in ["contact info", "resume"]):
-                    modal.locator(NEXT_BTN).click()
-
-                elif any(k in txt for k in ["questions", "education", "work", "additional"]):
-                    secs = modal.locator("section.artdeco-modal__section")
-                    for j in range(secs.count()):
-                        sec = secs.nth(j)
-                        print(f"[DEBUG] Section {j+1}/{secs.count()} text: {sec.inner_text().strip()}")
-                        did_fill = False
-
-                        # Handle all selects
-                        for sel_idx in range(sec.locator("select").count()):
-                            sel = sec.locator("select").nth(sel_idx)
-                            label = sec.inner_text().strip()
-                            opts = [o.inner_text().strip() for o in sel.locator("option").all() if o.get_attribute("value")]
-                            print(f"[DEBUG] SELECT {sel_idx+1}: {label} options: {opts}")
-                            ans = answer_select(label, opts)
-                            print(f"[DEBUG] Filling SELECT with: {ans}")
-                            sel.select_option(label=ans)
-                            did_fill = True
-
-                        # Handle all radio groups
-                        for radio_idx in range(sec.locator("input[type=radio]").count()):
-                            # Find the label for this radio
-                            radio = sec.locator("input[type=radio]").nth(radio_idx)
-                            labels = [lbl.inner_text().strip() for lbl in sec.locator("label").all() if lbl.inner_text().strip()]
-                            label = sec.inner_text().strip()
-                            print(f"[DEBUG] RADIO {radio_idx+1}: {label} options: {labels}")
-                            choice = answer_select(label, labels)
-                            print(f"[DEBUG] Clicking RADIO: {choice}")
-                            lbl = sec.locator(f"label:has-text('{choice}')")
-                            if lbl.count():
-                                lbl.first.click()
-                            else:
-                                radio.check()
-                            did_fill = True
-
-
-                        # Handle all number inputs (input[type=number])
-                        for num_idx in range(sec.locator("input[type=number]").count()):
-                            num = sec.locator("input[type=number]").nth(num_idx)
-                            label = sec.inner_text().strip()
-                            print(f"[DEBUG] NUMBER {num_idx+1}: {label}")
-                            # Always fill 0 for years of experience or if error message is present
-                            fill_zero = False
-                            if "year" in label.lower() and "experience" in label.lower():
-                                fill_zero = True
-                            # Check for error message
-                            error_msg = num.evaluate("el => el.parentElement && el.parentElement.querySelector('.artdeco-inline-feedback__message') ? el.parentElement.querySelector('.artdeco-inline-feedback__message').innerText : ''")
-                            if error_msg and "whole number" in error_msg:
-                                print(f"[DEBUG] Detected error message for number input: {error_msg}")
-                                fill_zero = True
-                            if fill_zero:
-                                ans = "0"
-                            else:
-                                ans = answer_text(label)
-                            print(f"[DEBUG] Filling NUMBER with: {ans}")
-                            num.fill(ans)
-                            did_fill = True
-
-                        # Handle all textareas and text inputs (input[type=text])
-                        for txt_idx in range(sec.locator("textarea, input[type=text]").count()):
-                            fld = sec.locator("textarea, input[type=text]").nth(txt_idx)
+                page.locator(JOB_CARD).nth(i).click()
+
+                # the previous job's Easy Apply button stays up until the details pane switches over
+                try:
+                    page.wait_for_function(JOB_SHOWN_JS, arg=meta["id"], timeout=10000)
+                except PWTimeout:
+                    logging.warning(f"Details for '{title}' never loaded, skipping")
+                    continue
+
+                # click Easy Apply
+                try:
+                    page.wait_for_selector(APPLY_BTN, timeout=10000)
+                    page.locator(APPLY_BTN).click()
+                except PWTimeout:
+                    btn = page.get_by_role("button", name="Easy Apply")
+                    if btn.is_visible():
+                        btn.click()
+                    else:
+                        logging.warning(f"'{title}' has no Easy Apply")
+                        continue
+
+                # application modal: the wait returns as soon as it opens
+                page.wait_for_selector("div[role='dialog']", timeout=15000)
+                modal = page.locator("div[role='dialog']").first
+
+                start = time.monotonic()
+                state_counts = {}
+                stuck = False
+                while True:
+                    state = modal.evaluate(MODAL_STATE_JS)
+                    state_key = f"{state['header']}::{state['buttons']}"
+                    state_counts[state_key] = state_counts.get(state_key, 0) + 1
+                    if state_counts[state_key] > 2:
+                        logging.warning(f"Modal stuck on '{state['header']}', moving on")
+                        close_modal(page, modal)
+                        stuck = True
+                        break
+                    txt = state["header"].lower()
+
+                    if any(k in txt for k in ["contact info", "resume"]):
+                        modal.locator(NEXT_BTN).click()
+
+                    elif any(k in txt for k in ["questions", "education", "work", "additional"]):
+                        secs = modal.locator("section.artdeco-modal__section")
+                        for j in range(secs.count()):
+                            sec = secs.nth(j)
                             label = sec.inner_text().strip()
                             lw = label.lower()
-                            print(f"[DEBUG] TEXT {txt_idx+1}: {label}")
-                            mapped = False
-                            # If the label asks for years of experience, or error message/placeholder indicates number, fill 0
-                            fill_zero = False
-                            if ("year" in lw and "experience" in lw) or ("years" in lw and "work" in lw):
-                                fill_zero = True
-                            # Check for error message
-                            error_msg = fld.evaluate("el => el.parentElement && el.parentElement.querySelector('.artdeco-inline-feedback__message') ? el.parentElement.querySelector('.artdeco-inline-feedback__message').innerText : ''")
-                            if error_msg and "whole number" in error_msg:
-                                print(f"[DEBUG] Detected error message for text input: {error_msg}")
-                                fill_zero = True
-                            # Check for placeholder
-                            placeholder = fld.get_attribute("placeholder") or ""
-                            if "number" in placeholder.lower():
-                                print(f"[DEBUG] Detected number placeholder: {placeholder}")
-                                fill_zero = True
-                            if fill_zero:
-                                print(f"[DEBUG] Detected years/number input, filling 0")
-                                fld.fill("0")
-                                mapped = True
+                            print(f"[DEBUG] Section {j+1}/{secs.count()} text: {label}")
+                            did_fill = False
+
+                            # Handle all selects
+                            for sel_idx, sel in enumerate(sec.locator("select").all()):
+                                opts = sel.evaluate("s => [...s.options].filter(o => o.value).map(o => o.text.trim())")
+                                print(f"[DEBUG] SELECT {sel_idx+1}: {label} options: {opts}")
+                                ans = answer_select(label, opts)
+                                print(f"[DEBUG] Filling SELECT with: {ans}")
+                                sel.select_option(label=ans)
+                                did_fill = True
+
+                            # Handle radio groups: the labels and the answer are the same for every radio in the section
+                            radios = sec.locator("input[type=radio]").all()
+                            if radios:
+                                labels = sec.evaluate("s => [...s.querySelectorAll('label')].map(l => l.innerText.trim()).filter(Boolean)")
+                                print(f"[DEBUG] RADIO x{len(radios)}: {label} options: {labels}")
+                                choice = answer_select(label, labels)
+                                print(f"[DEBUG] Clicking RADIO: {choice}")
+                                lbl = sec.locator(f"label:has-text('{choice}')")
+                                if lbl.count():
+                                    lbl.first.click()
+                                else:
+                                    radios[0].check()
+                                did_fill = True
+
+
+                            # Handle all number inputs (input[type=number])
+                            for num_idx, num in enumerate(sec.locator("input[type=number]").all()):
+                                print(f"[DEBUG] NUMBER {num_idx+1}: {label}")
+                                # Always fill 0 for years of experience or if error message is present
+                                fill_zero = False
+                                if "year" in lw and "experience" in lw:
+                                    fill_zero = True
+                                # Check for error message
+                                error_msg = num.evaluate("el => el.parentElement && el.parentElement.querySelector('.artdeco-inline-feedback__message') ? el.parentElement.querySelector('.artdeco-inline-feedback__message').innerText : ''")
+                                if error_msg and "whole number" in error_msg:
+                                    print(f"[DEBUG] Detected error message for number input: {error_msg}")
+                                    fill_zero = True
+                                if fill_zero:
+                                    ans = "0"
+                                else:
+                                    ans = answer_text(label)
+                                print(f"[DEBUG] Filling NUMBER with: {ans}")
+                                num.fill(ans)
                                 did_fill = True
-                            else:
-                                for key, val in ANSWER_MAP.items():
-                                    if key in lw:
-                                        print(f"[DEBUG] Using mapped answer for '{key}': {val}")
+
+                            # Handle all textareas and text inputs (input[type=text])
+                            for txt_idx, fld in enumerate(sec.locator("textarea, input[type=text]").all()):
+                                print(f"[DEBUG] TEXT {txt_idx+1}: {label}")
+                                mapped = False
+                                # If the label asks for years of experience, or error message/placeholder indicates number, fill 0
+                                fill_zero = False
+                                if ("year" in lw and "experience" in lw) or ("years" in lw and "work" in lw):
+                                    fill_zero = True
+                                # Check for error message
+                                error_msg = fld.evaluate("el => el.parentElement && el.parentElement.querySelector('.artdeco-inline-feedback__message') ? el.parentElement.querySelector('.artdeco-inline-feedback__message').innerText : ''")
+                                if error_msg and "whole number" in error_msg:
+                                    print(f"[DEBUG] Detected error message for text input: {error_msg}")
+                                    fill_zero = True
+                                # Check for placeholder
+                                placeholder = fld.get_attribute("placeholder") or ""
+                                if "number" in placeholder.lower():
+                                    print(f"[DEBUG] Detected number placeholder: {placeholder}")
+                                    fill_zero = True
+                                if fill_zero:
+                                    print(f"[DEBUG] Detected years/number input, filling 0")
+                                    fld.fill("0")
+                                    mapped = True
+                                    did_fill = True
+                                else:
+                                    m = ANSWER_RE.search(lw)
+                                    if m:
+                                        val = ANSWER_MAP[m.group(0)]
+                                        print(f"[DEBUG] Using mapped answer for '{m.group(0)}': {val}")
                                         fld.fill(val)
                                         mapped = True
                                         did_fill = True
-                                        break
-                            if not mapped:
-                                ans = answer_text(label)
-                                print(f"[DEBUG] Filling TEXT with: {ans}")
-                                fld.fill(ans)
-                                did_fill = True
+                                if not mapped:
+                                    ans = answer_text(label)
+                                    print(f"[DEBUG] Filling TEXT with: {ans}")
+                                    fld.fill(ans)
+                                    did_fill = True
+
+                            if not did_fill:
+                                print(f"[WARN] No fillable field detected in section {j+1}")
+
+                        if modal.locator(NEXT_BTN).is_visible():
+                            print("[DEBUG] Clicking NEXT after questions page.")
+                            modal.locator(NEXT_BTN).click()
+                        else:
+                            print("[DEBUG] Clicking REVIEW after questions page.")
+                            modal.locator(REVIEW_BTN).click()
 
-                        if not did_fill:
-                            print(f"[WARN] No fillable field detected in section {j+1}")
+                    elif modal.locator(SUBMIT_BTN).is_visible():
+                        modal.locator(SUBMIT_BTN).click()
+                        break
 
-                    if modal.locator(NEXT_BTN).is_visible():
-                        print("[DEBUG] Clicking NEXT after questions page.")
-                        modal.locator(NEXT_BTN).click()
                     else:
-                        print("[DEBUG] Clicking REVIEW after questions page.")
-                        modal.locator(REVIEW_BTN).click()
+                        if modal.locator(NEXT_BTN).is_visible():
+                            modal.locator(NEXT_BTN).click()
+                        else:
+                            close_modal(page, modal)
+                            # Removed logging for unknown modal state as requested
+                            break
 
-                elif modal.locator(SUBMIT_BTN).is_visible():
-                    modal.locator(SUBMIT_BTN).click()
-                    break
+                    wait_for_modal_change(page, modal, state_key)
 
-                else:
-                    if modal.locator(NEXT_BTN).is_visible():
-                        modal.locator(NEXT_BTN).click()
-                    else:
-                        cancel = modal.locator("button:has-text('Cancel'), button:has-text('Dismiss')")
-                        if cancel.count():
-                            cancel.first.click()
-                        else:
-                            page.keyboard.press("Escape")
-                        # Removed logging for unknown modal state as requested
-                        break
+                if stuck:
+                    # never submitted, so don't record it
+                    continue
 
-                human_pause(0.7, 1.2)
-
-            # dismiss follow-up
-            if page.locator(NOT_NOW).count():
-                page.locator(NOT_NOW).click()
-
-            dur = f"{int(time.monotonic() - start)} sec"
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            results.append({
-                "Title":    title,
-                "Company":  company,
-                "Link":     link,
-                "DateApplied": timestamp,
-                "Runtime":  dur
-            })
-            logging.info(f"Applied #{i+1}: {title} at {company} ({dur})")
-            human_pause(1.2, 2.0)
-
-        # write results
-        fieldnames = ["Title", "Company", "Link", "DateApplied", "Runtime"]
-        exists = os.path.isfile(CSV_PATH)
-        with open(CSV_PATH, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if not exists:
-                writer.writeheader()
-            writer.writerows(results)
+                # dismiss follow-up
+                if page.locator(NOT_NOW).count():
+                    page.locator(NOT_NOW).click()
+
+                dur = f"{int(time.monotonic() - start)} sec"
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                record = {
+                    "Title":    title,
+                    "Company":  company,
+                    "Link":     link,
+                    "DateApplied": timestamp,
+                    "Runtime":  dur
+                }
+                results.append(record)
+                writer.writerow(record)
+                csv_f.flush()
+                logging.info(f"Applied #{i+1}: {title} at {company} ({dur})")
+                human_pause(1.2, 2.0)
+        finally:
+            csv_f.close()
 
         logging.info(f"Saved {len(results)} records to {CSV_PATH}")
         browser.close()
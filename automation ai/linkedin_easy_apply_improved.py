@@ -5,69 +5,124 @@ A robust, state-machine–driven LinkedIn Easy Apply bot using Playwright + Open
 Enhanced with pre-filled field detection, better modal navigation, and timeout mechanisms.
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import time
-import random
+import re
 import logging
 import csv
+import difflib
+import json
+import atexit
+import hashlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Tuple, Dict, Set
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional, List, Tuple, Dict, Set
+from urllib.parse import quote, urlencode, urljoin
 
 from dotenv import load_dotenv
-import openai
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout, Locator, Page
-from docx import Document
 
-print("Enhanced LinkedIn Easy Apply Bot started")
+# openai/httpx, playwright and docx are imported where they are used so the helpers can be
+# imported (e.g. by test_field_detection.py) without the heavy imports or any env checks
+if TYPE_CHECKING:
+    from playwright.sync_api import Locator, Page
 
 load_dotenv()
 
+log = logging.getLogger(__name__)
+
 EMAIL = os.getenv("LINKEDIN_EMAIL")
 PASSWORD = os.getenv("LINKEDIN_PASSWORD")
 RESUME_PATH = os.getenv("RESUME_PATH")
 OPENAI_KEY = os.getenv("OPENAI_API_KEY")
 MAX_APPLIES = int(os.getenv("MAX_APPLIES", "5"))
 CSV_PATH = os.getenv("CSV_PATH", "applications.csv")
+CSV_FIELDS = ["Title", "Company", "Link", "DateApplied", "Runtime", "Status"]
 MODAL_TIMEOUT = int(os.getenv("MODAL_TIMEOUT", "300"))
+QA_CACHE_PATH = os.getenv("QA_CACHE_PATH", ".qa_cache.json")
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+WORKERS = max(1, int(os.getenv("WORKERS", "1")))
+STORAGE_STATE_PATH = os.getenv("STORAGE_STATE_PATH", "li_state.json")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+JOB_KEYWORDS = os.getenv("JOB_KEYWORDS", "Software Engineer Intern")
+
+def check_env():
+    print("ENV CHECK:")
+    print("EMAIL:", EMAIL)
+    print("PASSWORD:", "OK" if PASSWORD else "MISSING")
+    print("RESUME_PATH:", RESUME_PATH)
+    print("OPENAI_KEY:", "OK" if OPENAI_KEY else "MISSING")
+    print("MAX_APPLIES:", MAX_APPLIES)
+    print("CSV_PATH:", CSV_PATH)
+    print("MODAL_TIMEOUT:", MODAL_TIMEOUT)
+    print("QA_CACHE_PATH:", QA_CACHE_PATH)
+    print("OPENAI_CONCURRENCY:", OPENAI_CONCURRENCY)
+    print("OPENAI_MODEL:", OPENAI_MODEL)
+    print("WORKERS:", WORKERS)
+    print("STORAGE_STATE_PATH:", STORAGE_STATE_PATH)
+    print("LOG_LEVEL:", LOG_LEVEL)
+    print("JOB_KEYWORDS:", JOB_KEYWORDS)
 
-print("ENV CHECK:")
-print("EMAIL:", EMAIL)
-print("PASSWORD:", "OK" if PASSWORD else "MISSING")
-print("RESUME_PATH:", RESUME_PATH)
-print("OPENAI_KEY:", "OK" if OPENAI_KEY else "MISSING")
-print("MAX_APPLIES:", MAX_APPLIES)
-print("CSV_PATH:", CSV_PATH)
-print("MODAL_TIMEOUT:", MODAL_TIMEOUT)
-
-if not EMAIL:
-    raise ValueError("LINKEDIN_EMAIL missing in .env")
-if not PASSWORD:
-    raise ValueError("LINKEDIN_PASSWORD missing in .env")
-if not OPENAI_KEY:
-    raise ValueError("OPENAI_API_KEY missing in .env")
-if not os.path.isfile(RESUME_PATH):
-    raise FileNotFoundError(f"Resume not found at {RESUME_PATH}")
-
-openai.api_key = OPENAI_KEY
+    if not EMAIL:
+        raise ValueError("LINKEDIN_EMAIL missing in .env")
+    if not PASSWORD:
+        raise ValueError("LINKEDIN_PASSWORD missing in .env")
+    if not OPENAI_KEY:
+        raise ValueError("OPENAI_API_KEY missing in .env")
+    if not RESUME_PATH or not os.path.isfile(RESUME_PATH):
+        raise FileNotFoundError(f"Resume not found at {RESUME_PATH}")
+
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """One OpenAI client for the whole run, so answer calls share warm HTTP/2 keep-alive connections"""
+    import httpx
+    from openai import OpenAI
+    
+    http_client = httpx.Client(
+        http2=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=OPENAI_CONCURRENCY, max_keepalive_connections=OPENAI_CONCURRENCY),
+    )
+    atexit.register(http_client.close)
+    # The answer helpers do their own retries and backoff
+    return OpenAI(api_key=OPENAI_KEY, http_client=http_client, max_retries=0)
 
 def verify_openai():
     try:
-        resp = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
+        resp = get_openai_client().chat.completions.create(
+            model=OPENAI_MODEL,
             messages=[{"role": "user", "content": "Say 'ready' if you're working."}],
             timeout=10
         )
         answer = resp.choices[0].message.content.strip().lower()
         if "ready" in answer:
-            logging.info("OpenAI is responding correctly.")
+            log.info("OpenAI is responding correctly.")
         else:
-            logging.warning(f"Unexpected OpenAI response: {answer}")
+            log.warning(f"Unexpected OpenAI response: {answer}")
     except Exception as e:
-        logging.error(f"OpenAI check failed: {e}")
+        log.error(f"OpenAI check failed: {e}")
         raise
 
 def load_resume_text(path: str) -> str:
+    # Reuse the extracted text while it is newer than the .docx; skips the zip/XML parse and the docx import
+    cache = path + ".cache.txt"
+    try:
+        if os.path.getmtime(cache) >= os.path.getmtime(path):
+            with open(cache, encoding="utf-8") as f:
+                result = f.read()
+            print(f"📄 Loaded resume from cache ({len(result)} characters)")
+            return result
+    except OSError:
+        pass
+    
+    from docx import Document
+    
     try:
         doc = Document(path)
         lines = []
@@ -76,13 +131,24 @@ def load_resume_text(path: str) -> str:
                 prefix = "- " if para.style.name.lower().startswith("list") else ""
                 lines.append(f"{prefix}{para.text.strip()}")
         result = "\n".join(lines)
-        print("📄 RESUME PREVIEW:", result[:500], "...\n")
+        print(f"📄 Loaded resume ({len(result)} characters)")
+        try:
+            with open(cache, "w", encoding="utf-8") as f:
+                f.write(result)
+        except OSError as e:
+            log.warning(f"Could not write resume cache {cache}: {e}")
         return result
     except Exception as e:
         print(f"Failed to read resume: {e}")
         raise
 
-RESUME_TEXT = load_resume_text(RESUME_PATH)
+@lru_cache(maxsize=None)
+def get_prompt_prefix() -> str:
+    """Static system prompt shared by every GPT call so OpenAI can reuse the cached prefix"""
+    return (
+        f"You are applying for a {JOB_KEYWORDS} position.\n"
+        f"Use my resume below to answer job application questions.\n\n{load_resume_text(RESUME_PATH)}\n"
+    )
 
 ANSWER_MAP = {
     "legally authorized to work": "Yes",
@@ -97,58 +163,108 @@ ANSWER_MAP = {
     "visa sponsorship": "No",
 }
 
-def human_pause(a=0.8, b=1.5):
-    time.sleep(random.uniform(a, b))
+# Longest keys first so e.g. "willing to relocate" wins over "relocate" at the same position
+_ANSWER_KEYS = sorted(ANSWER_MAP, key=len, reverse=True)
+_ANSWER_RE = re.compile("(" + "|".join(re.escape(k) for k in _ANSWER_KEYS) + ")")
+
+def match_answer_map(text: str) -> Optional[Tuple[str, str]]:
+    """Return (key, answer) for the ANSWER_MAP key found in the text, if any"""
+    m = _ANSWER_RE.search(text.lower())
+    if m:
+        return m.group(1), ANSWER_MAP[m.group(1)]
+    return None
+
+def load_qa_cache(path: str) -> Dict[str, str]:
+    """Load previously answered questions so recurring prompts skip the API"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+        print(f"💾 Loaded {len(cache)} cached answers from {path}")
+        return cache
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log.warning(f"Ignoring unreadable Q&A cache {path}: {e}")
+        return {}
+
+_qa_cache: Dict[str, str] = {}
+
+def save_qa_cache():
+    try:
+        # Snapshot first: worker threads may add answers while the dump iterates
+        with open(QA_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(dict(_qa_cache), f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        log.warning(f"Failed to save Q&A cache to {QA_CACHE_PATH}: {e}")
+
+def qa_cache_key(q: str, options: Optional[List[str]] = None) -> str:
+    """Hash a normalized question (plus its sorted options for selects)"""
+    # Collapse whitespace too: the same label comes back with different line breaks between layouts
+    raw = " ".join(q.split()).lower()
+    if options is not None:
+        raw += "||" + "|".join(sorted(options))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
 def is_field_empty(field: Locator) -> bool:
-    """Check if a field is empty or contains only whitespace"""
+    """Check if a single field is empty or contains only whitespace (costs one round trip per field;
+    process_form_fields gets every value at once from EXTRACT_FIELDS_JS instead)"""
     try:
         current_value = field.input_value() or ""
         return current_value.strip() == ""
     except Exception:
         return True
 
+# (keywords, answer) pairs checked in order; the first hit wins
+SMART_FALLBACKS = (
+    (("year", "experience", "salary", "number"), "0"),
+    (("authorized", "eligible", "legal"), "Yes"),
+    (("sponsor", "visa", "h1b"), "No"),
+    (("relocate", "move", "willing"), "Yes"),
+    (("start", "available", "notice"), "Immediately"),
+    (("degree", "education", "university"), "Bachelor's Degree"),
+    (("cover letter", "why", "interest"),
+     "I am excited about this opportunity and believe my skills align well with the requirements."),
+)
+
 def get_smart_fallback(question: str) -> str:
     """Provide context-aware fallback answers based on question content"""
     q_lower = question.lower()
     
-    if any(word in q_lower for word in ["year", "experience", "salary", "number"]):
-        return "0"
-    elif any(word in q_lower for word in ["authorized", "eligible", "legal"]):
-        return "Yes"
-    elif any(word in q_lower for word in ["sponsor", "visa", "h1b"]):
-        return "No"
-    elif any(word in q_lower for word in ["relocate", "move", "willing"]):
-        return "Yes"
-    elif any(word in q_lower for word in ["start", "available", "notice"]):
-        return "Immediately"
-    elif any(word in q_lower for word in ["degree", "education", "university"]):
-        return "Bachelor's Degree"
-    elif any(word in q_lower for word in ["cover letter", "why", "interest"]):
-        return "I am excited about this opportunity and believe my skills align well with the requirements."
-    else:
-        return "Yes"
+    for words, answer in SMART_FALLBACKS:
+        if any(word in q_lower for word in words):
+            return answer
+    return "Yes"
 
-def answer_text_with_retry(q: str, max_retries: int = 3) -> str:
+def with_context(prompt: str, context: str) -> str:
+    """Prefix a prompt with the surrounding form text; it helps the model but is never part of the cache key"""
+    return f"Form section (context only):\n{context}\n\n{prompt}" if context else prompt
+
+def answer_text_with_retry(q: str, max_retries: int = 3, context: str = "") -> str:
     """Answer text questions with retry logic and smart fallbacks"""
+    key = qa_cache_key(q)
+    if key in _qa_cache:
+        print(f"[AI] TEXT Answer (cached): {_qa_cache[key]}")
+        return _qa_cache[key]
+    
     for attempt in range(max_retries):
         try:
             print(f"\n[AI] Answering TEXT Q (attempt {attempt + 1}): {q}")
-            resp = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            resp = get_openai_client().chat.completions.create(
+                model=OPENAI_MODEL,
                 temperature=0.5,
-                max_tokens=80,
-                timeout=15,
-                messages=[{"role": "user", "content":
-                    f"You are applying for a Software Engineer Intern position.\n"
-                    f"Use my resume to answer concisely (max 50 words):\n\n{RESUME_TEXT}\n\nQuestion: {q}\nAnswer:"
-                }]
+                max_tokens=60,
+                timeout=8,
+                messages=[
+                    {"role": "system", "content": get_prompt_prefix()},
+                    {"role": "user", "content": with_context(f"Answer concisely (max 50 words).\nQuestion: {q}\nAnswer:", context)}
+                ]
             )
             answer = resp.choices[0].message.content.strip()
             print(f"[AI] TEXT Answer: {answer}")
+            _qa_cache[key] = answer
             return answer
         except Exception as e:
-            logging.warning(f"GPT attempt {attempt + 1} failed for: {q} – {e}")
+            log.warning(f"GPT attempt {attempt + 1} failed for: {q} – {e}")
             if attempt == max_retries - 1:
                 fallback = get_smart_fallback(q)
                 print(f"[AI] Using smart fallback: {fallback}")
@@ -157,102 +273,253 @@ def answer_text_with_retry(q: str, max_retries: int = 3) -> str:
     
     return get_smart_fallback(q)
 
-def answer_select_with_retry(q: str, options: List[str], max_retries: int = 3) -> str:
+def get_mapped_option(q: str, options: List[str]) -> Optional[str]:
+    """Return the option matching a hardcoded ANSWER_MAP answer, if any"""
+    mapped = match_answer_map(q)
+    if mapped:
+        key, val = mapped
+        option = match_option(val, options)
+        if option:
+            print(f"[AI] Using mapped answer for '{key}': {option}")
+            return option
+    return None
+
+def match_option(answer: str, options: List[str]) -> Optional[str]:
+    """Map a free-form GPT answer onto one of the available options"""
+    if not answer.strip():
+        return None
+    lowered = {option.lower(): option for option in options}
+    answer = answer.strip().lower()
+    # Exact first: substring alone maps "10" onto "1" and "No" onto "Not applicable"
+    if answer in lowered:
+        return lowered[answer]
+    for key, option in lowered.items():
+        if answer in key or key in answer:
+            return option
+    # Near-misses ("Bachelors" vs "Bachelor's Degree") resolve locally instead of costing another API round
+    matches = difflib.get_close_matches(answer, list(lowered), n=1, cutoff=0.5)
+    return lowered[matches[0]] if matches else None
+
+def pick_numbered_option(answer: str, options: List[str]) -> Optional[str]:
+    """Resolve a numeric GPT reply to its option, falling back to text matching"""
+    if not answer.strip():
+        return None
+    # Only a bare reply like "2" or "2." is an index; "3-5 years" must go through text matching
+    m = re.fullmatch(r"\s*(\d+)\.?\s*", answer)
+    if m:
+        index = int(m.group(1))
+        return options[index - 1] if 1 <= index <= len(options) else None
+    return match_option(answer, options)
+
+def answer_select_with_retry(q: str, options: List[str], max_retries: int = 3, context: str = "") -> str:
     """Answer select questions with retry logic and smart fallbacks"""
     if not options:
         return ""
     
-    for key, val in ANSWER_MAP.items():
-        if key in q.lower():
-            for option in options:
-                if val.lower() in option.lower():
-                    print(f"[AI] Using mapped answer for '{key}': {option}")
-                    return option
+    mapped = get_mapped_option(q, options)
+    if mapped:
+        return mapped
+    
+    key = qa_cache_key(q, options)
+    cached = _qa_cache.get(key)
+    if cached in options:
+        print(f"[AI] SELECT Answer (cached): {cached}")
+        return cached
     
     for attempt in range(max_retries):
         try:
             print(f"\n[AI] Answering SELECT Q (attempt {attempt + 1}): {q}\nOptions: {options}")
-            resp = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            resp = get_openai_client().chat.completions.create(
+                model=OPENAI_MODEL,
                 temperature=0.3,
-                max_tokens=40,
-                timeout=15,
-                messages=[{"role": "user", "content":
-                    f"You are applying for a Software Engineer Intern position.\n"
-                    f"Use my resume to choose the best option:\n\n{RESUME_TEXT}\n\n"
-                    f"Question: {q}\nOptions:\n" + "\n".join(f"- {o}" for o in options) + 
-                    "\nReply exactly with the best option text."
-                }]
+                max_tokens=3,
+                timeout=8,
+                messages=[
+                    {"role": "system", "content": get_prompt_prefix()},
+                    {"role": "user", "content": with_context(
+                        f"Choose the best option.\nQuestion: {q}\nOptions:\n" +
+                        "\n".join(f"{i}. {o}" for i, o in enumerate(options, 1)) +
+                        "\nReply with only the number of the best option.",
+                        context
+                    )}
+                ]
             )
             answer = resp.choices[0].message.content.strip()
             
-            for option in options:
-                if answer.lower() in option.lower() or option.lower() in answer.lower():
-                    print(f"[AI] SELECT Answer: {option}")
-                    return option
+            option = pick_numbered_option(answer, options)
+            if option:
+                print(f"[AI] SELECT Answer: {option}")
+                _qa_cache[key] = option
+                return option
             
             print(f"[AI] SELECT Answer (first option fallback): {options[0]}")
             return options[0]
             
         except Exception as e:
-            logging.warning(f"GPT select attempt {attempt + 1} failed for: {q} – {e}")
+            log.warning(f"GPT select attempt {attempt + 1} failed for: {q} – {e}")
             if attempt == max_retries - 1:
-                fallback = get_smart_fallback(q)
-                for option in options:
-                    if fallback.lower() in option.lower():
-                        print(f"[AI] Using smart fallback select: {option}")
-                        return option
+                option = match_option(get_smart_fallback(q), options)
+                if option:
+                    print(f"[AI] Using smart fallback select: {option}")
+                    return option
                 print(f"[AI] Using first option fallback: {options[0]}")
                 return options[0]
             time.sleep(2 ** attempt)
     
     return options[0]
 
-def find_easy_apply_button(page: Page) -> Optional[Locator]:
-    """Find Easy Apply button with multiple selector fallbacks"""
-    selectors = [
-        "button[data-test-job-apply-button]",
-        "button[data-control-name='jobdetails_topcard_inapply']",
-        
-        "button:has-text('Easy Apply')",
-        "button:has-text('Apply now')",
-        "button:has-text('Apply')",
-        
-        "button[aria-label*='Easy Apply']",
-        "button[aria-label*='Apply']",
-        
-        ".jobs-apply-button",
-        ".jobs-s-apply",
-        ".artdeco-button--primary:has-text('Easy Apply')",
-        ".artdeco-button:has-text('Easy Apply')",
-        
-        "[data-test-id*='apply']",
-        "[data-test*='apply']",
-        "[data-automation-id*='apply']",
-        
-        "button[class*='apply']:has-text('Easy Apply')",
-        "button[class*='apply']:has-text('Apply')",
-        
-        "button[type='button']:has-text('Easy Apply')",
-        "a[role='button']:has-text('Easy Apply')"
-    ]
+MAX_BATCH_SIZE = 25
+
+def answer_batch(questions: List[Dict], max_retries: int = 2) -> Dict[str, str]:
+    """Answer several questions with one GPT request returning a JSON object of id -> answer"""
+    if not questions:
+        return {}
+    
+    # Fields from one section share its text, so each distinct section is sent once and referenced by index
+    contexts: List[str] = []
+    payload = []
+    for item in questions:
+        entry = {"id": item["id"], "q": item["q"]}
+        if item.get("options"):
+            entry["options"] = item["options"]
+        if item.get("context"):
+            if item["context"] not in contexts:
+                contexts.append(item["context"])
+            entry["section"] = contexts.index(item["context"])
+        payload.append(entry)
+    sections = (
+        f"Form sections (context only, referenced by index):\n{json.dumps(contexts, ensure_ascii=False)}\n\n"
+        if contexts else ""
+    )
     
-    for i, selector in enumerate(selectors):
+    for attempt in range(max_retries):
         try:
-            print(f"[DEBUG] Trying selector {i+1}/{len(selectors)}: {selector}")
-            btn = page.locator(selector).first
-            if btn.count() > 0 and btn.is_visible():
-                print(f"[DEBUG] ✅ Found Easy Apply button with selector: {selector}")
-                return btn
-            elif btn.count() > 0:
-                print(f"[DEBUG] ❌ Selector found element but not visible: {selector}")
-            else:
-                print(f"[DEBUG] ❌ Selector found no elements: {selector}")
+            print(f"\n[AI] Answering {len(questions)} questions in one batch (attempt {attempt + 1})")
+            resp = get_openai_client().chat.completions.create(
+                model=OPENAI_MODEL,
+                temperature=0.3,
+                max_tokens=80 * len(questions),
+                timeout=30,
+                response_format={"type": "json_object"},
+                messages=[
+                    {"role": "system", "content": get_prompt_prefix()},
+                    {"role": "user", "content":
+                        f"Answer each question concisely (max 50 words). "
+                        f"For questions with options, reply exactly with the best option text.\n"
+                        f"{sections}"
+                        f"Questions:\n{json.dumps(payload, ensure_ascii=False)}\n\n"
+                        f"Return a JSON object mapping every question id to its answer."
+                    }
+                ]
+            )
+            answers = json.loads(resp.choices[0].message.content)
+            print(f"[AI] BATCH Answers: {answers}")
+            return {str(k): str(v).strip() for k, v in answers.items()}
         except Exception as e:
-            print(f"[DEBUG] ❌ Selector failed: {selector} - {str(e)}")
+            log.warning(f"GPT batch attempt {attempt + 1} failed for {len(questions)} questions – {e}")
+            if attempt < max_retries - 1:
+                time.sleep(2 ** attempt)
+    
+    return {}
+
+def answer_questions(questions: List[Dict]) -> Dict[str, str]:
+    """Resolve answers for collected questions, sending everything not mapped or cached in one batch"""
+    answers = {}
+    to_ask = []
+    
+    for item in questions:
+        options = item.get("options")
+        if options:
+            mapped = get_mapped_option(item["q"], options)
+            if mapped:
+                answers[item["id"]] = mapped
+                continue
+        cached = _qa_cache.get(qa_cache_key(item["q"], options))
+        if cached is not None and (not options or cached in options):
+            print(f"[AI] Answer (cached): {cached}")
+            answers[item["id"]] = cached
+            continue
+        to_ask.append(item)
+    
+    batch = {}
+    if len(to_ask) > 1:
+        # Keep each request small enough that the model stays accurate and the reply stays fast
+        for i in range(0, len(to_ask), MAX_BATCH_SIZE):
+            batch.update(answer_batch(to_ask[i:i + MAX_BATCH_SIZE]))
+    leftovers = []
+    
+    for item in to_ask:
+        options = item.get("options")
+        raw = batch.get(item["id"], "")
+        if options:
+            choice = match_option(raw, options) if raw else None
+            if choice:
+                _qa_cache[qa_cache_key(item["q"], options)] = choice
+                answers[item["id"]] = choice
+                continue
+        elif raw:
+            _qa_cache[qa_cache_key(item["q"])] = raw
+            answers[item["id"]] = raw
             continue
+        leftovers.append(item)
+    
+    answers.update(zip((item["id"] for item in leftovers), answer_many(leftovers)))
+    return answers
+
+def answer_many(questions: List[Dict]) -> List[str]:
+    """Answer questions individually but concurrently, bounded by OPENAI_CONCURRENCY"""
+    def answer_one(item: Dict) -> str:
+        if item.get("options"):
+            return answer_select_with_retry(item["q"], item["options"], context=item.get("context", ""))
+        return answer_text_with_retry(item["q"], context=item.get("context", ""))
+    
+    if len(questions) <= 1:
+        return [answer_one(item) for item in questions]
     
-    print(f"[DEBUG] ⚠️ No Easy Apply button found with any of {len(selectors)} selectors")
+    print(f"[AI] Answering {len(questions)} questions concurrently")
+    with ThreadPoolExecutor(max_workers=min(OPENAI_CONCURRENCY, len(questions))) as pool:
+        return list(pool.map(answer_one, questions))
+
+EASY_APPLY_SELECTORS = [
+    "button[data-test-job-apply-button]",
+    "button[data-control-name='jobdetails_topcard_inapply']",
+    "button:has-text('Easy Apply')",
+    "button[aria-label*='Easy Apply']",
+    ".jobs-apply-button",
+    ".jobs-s-apply",
+    ".artdeco-button--primary:has-text('Easy Apply')",
+    ".artdeco-button:has-text('Easy Apply')",
+    "button[class*='apply']:has-text('Easy Apply')",
+    "button[type='button']:has-text('Easy Apply')",
+    "a[role='button']:has-text('Easy Apply')"
+]
+
+# Generic "Apply" matches also hit unrelated buttons, so they only run if nothing above is visible
+EASY_APPLY_FALLBACK_SELECTORS = [
+    "button:has-text('Apply now')",
+    "button:has-text('Apply')",
+    "button[aria-label*='Apply']",
+    "[data-test-id*='apply']",
+    "[data-test*='apply']",
+    "[data-automation-id*='apply']",
+    "button[class*='apply']:has-text('Apply')"
+]
+
+EASY_APPLY_SELECTOR_TIERS = [", ".join(EASY_APPLY_SELECTORS), ", ".join(EASY_APPLY_FALLBACK_SELECTORS)]
+
+def find_easy_apply_button(page: Page) -> Optional[Locator]:
+    """Find Easy Apply button with one union query per selector tier"""
+    for tier, selector in enumerate(EASY_APPLY_SELECTOR_TIERS, 1):
+        btn = page.locator(f"{selector} >> visible=true").first
+        try:
+            btn.wait_for(state="visible", timeout=500)
+            log.debug("✅ Found Easy Apply button with selector tier %s", tier)
+            return btn
+        except Exception:
+            log.debug("❌ No visible Easy Apply button for selector tier %s", tier)
+    
+    total = len(EASY_APPLY_SELECTORS) + len(EASY_APPLY_FALLBACK_SELECTORS)
+    log.debug("⚠️ No Easy Apply button found with any of %s selectors", total)
     return None
 
 def find_navigation_button(modal: Locator) -> Tuple[Optional[Locator], str]:
@@ -282,199 +549,231 @@ def find_navigation_button(modal: Locator) -> Tuple[Optional[Locator], str]:
             try:
                 btn = modal.locator(selector).first
                 if btn.is_visible():
-                    print(f"[DEBUG] Found {button_type} button with selector: {selector}")
+                    log.debug("Found %s button with selector: %s", button_type, selector)
                     return btn, button_type
             except Exception:
                 continue
     
     return None, "none"
 
-def get_modal_state(modal: Locator) -> str:
+MODAL_STATE_JS = """
+(modal) => ({
+    header: (modal.querySelector("h1, h2, h3, h4")?.innerText || "").trim(),
+    buttons: [...modal.querySelectorAll("button")]
+        .filter(b => b.getClientRects().length > 0)
+        .map(b => b.innerText.trim())
+        .filter(Boolean)
+        .slice(0, 5)
+        .join("|"),
+    sections: modal.querySelectorAll("section, div.form-section, .artdeco-modal__section").length,
+})
+"""
+
+# How often the same modal state may come back before we treat the modal as stuck
+MAX_STATE_REPEATS = 2
+
+def get_modal_snapshot(modal: Locator) -> Dict:
+    """Read the modal header, visible button labels and section count in one evaluate"""
+    return modal.evaluate(MODAL_STATE_JS)
+
+def get_modal_state(modal: Locator, snapshot: Optional[Dict] = None) -> str:
     """Get a string representation of the current modal state for loop detection"""
     try:
-        header_text = ""
-        headers = modal.locator("h1, h2, h3, h4")
-        if headers.count() > 0:
-            header_text = headers.first.inner_text().strip()
-        
-        button_text = ""
-        buttons = modal.locator("button")
-        if buttons.count() > 0:
-            button_texts = []
-            for i in range(min(buttons.count(), 5)):
-                try:
-                    btn_text = buttons.nth(i).inner_text().strip()
-                    if btn_text:
-                        button_texts.append(btn_text)
-                except Exception:
-                    continue
-            button_text = "|".join(button_texts)
-        
-        return f"{header_text}::{button_text}"
+        snapshot = snapshot or get_modal_snapshot(modal)
+        return f"{snapshot['header']}::{snapshot['buttons']}::{snapshot['sections']}"
     except Exception:
         return "unknown_state"
 
-def process_form_fields(section: Locator) -> bool:
-    """Process all form fields in a section with pre-filled detection"""
-    did_fill = False
-    
+# True once the modal is gone or its get_modal_state() key differs from `prev`
+MODAL_CHANGED_JS = f"""
+([modal, prev]) => {{
+    if (!modal.isConnected) return true;
+    const s = ({MODAL_STATE_JS.strip()})(modal);
+    return `${{s.header}}::${{s.buttons}}::${{s.sections}}` !== prev;
+}}
+"""
+
+def wait_for_modal_change(page: Page, modal: Locator, prev_state: str, timeout_ms: int = 3000):
+    """Wait for the modal to move on after a click; returns as soon as it does instead of sleeping"""
     try:
-        selects = section.locator("select")
-        for sel_idx in range(selects.count()):
-            sel = selects.nth(sel_idx)
-            try:
-                current_value = sel.input_value() or ""
-                if current_value.strip():
-                    print(f"[DEBUG] SELECT {sel_idx+1} already filled with: {current_value}")
-                    continue
-                
-                label = section.inner_text().strip()
-                options = []
-                option_elements = sel.locator("option")
-                for opt_idx in range(option_elements.count()):
-                    opt = option_elements.nth(opt_idx)
-                    value = opt.get_attribute("value")
-                    text = opt.inner_text().strip()
-                    if value and text and text.lower() not in ["select", "choose", "pick"]:
-                        options.append(text)
-                
-                if options:
-                    print(f"[DEBUG] SELECT {sel_idx+1}: {label} options: {options}")
-                    ans = answer_select_with_retry(label, options)
-                    sel.select_option(label=ans)
-                    did_fill = True
-                    print(f"[DEBUG] Filled SELECT with: {ans}")
-            except Exception as e:
-                print(f"[WARN] Failed to process select {sel_idx+1}: {e}")
+        page.wait_for_function(MODAL_CHANGED_JS, arg=[modal.element_handle(timeout=1000), prev_state], timeout=timeout_ms)
+    except Exception:
+        # Unchanged after the timeout: the duplicate-state check in the modal loop takes it from here
+        pass
+
+EXTRACT_FIELDS_JS = """
+(root) => [...root.querySelectorAll("select, textarea, input[type=text], input[type=number], input[type=radio]")].map((el, i) => {
+    el.setAttribute("data-ea-idx", i);
+    const labelEl = el.id ? root.querySelector(`label[for="${CSS.escape(el.id)}"]`) : null;
+    const feedback = el.parentElement && el.parentElement.querySelector(".artdeco-inline-feedback__message");
+    return {
+        idx: i,
+        tag: el.tagName.toLowerCase(),
+        type: (el.type || "").toLowerCase(),
+        name: el.name || "",
+        label: (labelEl ? labelEl.innerText : (el.getAttribute("aria-label") || "")).trim(),
+        legend: (el.closest("fieldset")?.querySelector("legend")?.innerText || "").trim(),
+        options: el.tagName === "SELECT" ? [...el.options].map(o => ({value: o.value, text: o.text.trim()})) : [],
+        placeholder: el.placeholder || "",
+        error: feedback ? feedback.innerText.trim() : "",
+        value: (el.value || "").trim(),
+        checked: !!el.checked,
+    };
+})
+"""
+
+FILL_FIELDS_JS = """
+(root, fills) => {
+    let filled = 0;
+    for (const [idx, value] of fills) {
+        const el = root.querySelector(`[data-ea-idx="${idx}"]`);
+        if (!el) continue;
+        if (el.type === "radio") {
+            el.click();
+        } else if (el.tagName === "SELECT") {
+            const opt = [...el.options].find(o => o.text.trim() === value);
+            if (!opt) continue;
+            el.value = opt.value;
+        } else {
+            const proto = el.tagName === "TEXTAREA" ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+        }
+        el.dispatchEvent(new Event("input", {bubbles: true}));
+        el.dispatchEvent(new Event("change", {bubbles: true}));
+        filled++;
+    }
+    return filled;
+}
+"""
+
+def extract_form_fields(section: Locator) -> List[Dict]:
+    """Describe every input in a section with a single in-browser DOM walk"""
+    return section.evaluate(EXTRACT_FIELDS_JS)
+
+# Numeric questions that always get "0" instead of a GPT answer
+NUMERIC_ZERO_WORDS = ("year", "experience", "salary")
+# Select entries that are prompts rather than real choices
+PLACEHOLDER_OPTIONS = frozenset({"select", "choose", "pick"})
+
+def process_form_fields(section: Locator, section_text: Optional[str] = None) -> bool:
+    """Process all form fields in a section with one DOM read, one batched GPT call and one DOM write"""
+    label = section_text if section_text is not None else section.inner_text().strip()
     
+    try:
+        fields = extract_form_fields(section)
     except Exception as e:
-        print(f"[WARN] Failed to process selects: {e}")
+        log.warning("Failed to read form fields: %s", e)
+        return False
     
-    try:
-        radios = section.locator("input[type=radio]")
-        processed_groups = set()
+    fills: List[Tuple[int, str]] = []
+    pending: List[Dict] = []
+    radio_groups: Dict[str, List[Dict]] = {}
+    
+    def question_for(text: str) -> Dict:
+        """Ask about the field's own label; the section text only goes along as context"""
+        if text and text != label:
+            return {"q": text, "context": label}
+        return {"q": label}
+    
+    for field in fields:
+        num = field["idx"] + 1
+        question = question_for(field["label"])
+        ql = question["q"].lower()
+        if field["type"] == "radio":
+            radio_groups.setdefault(field["name"] or f"radio-{num}", []).append(field)
+            continue
         
-        for radio_idx in range(radios.count()):
-            radio = radios.nth(radio_idx)
-            try:
-                name = radio.get_attribute("name")
-                if name in processed_groups:
-                    continue
-                processed_groups.add(name)
-                
-                if radio.is_checked():
-                    print(f"[DEBUG] RADIO group '{name}' already has selection")
-                    continue
-                
-                group_radios = section.locator(f"input[type=radio][name='{name}']")
-                labels = []
-                for group_idx in range(group_radios.count()):
-                    group_radio = group_radios.nth(group_idx)
-                    try:
-                        label_element = section.locator(f"label[for='{group_radio.get_attribute('id')}']")
-                        if label_element.count() > 0:
-                            labels.append(label_element.first.inner_text().strip())
-                        else:
-                            value = group_radio.get_attribute("value")
-                            if value:
-                                labels.append(value)
-                    except Exception:
-                        continue
-                
-                if labels:
-                    question = section.inner_text().strip()
-                    print(f"[DEBUG] RADIO group '{name}': {question} options: {labels}")
-                    choice = answer_select_with_retry(question, labels)
-                    
-                    for group_idx in range(group_radios.count()):
-                        group_radio = group_radios.nth(group_idx)
-                        try:
-                            label_element = section.locator(f"label[for='{group_radio.get_attribute('id')}']")
-                            if label_element.count() > 0:
-                                label_text = label_element.first.inner_text().strip()
-                                if choice.lower() in label_text.lower():
-                                    group_radio.check()
-                                    did_fill = True
-                                    print(f"[DEBUG] Selected RADIO: {label_text}")
-                                    break
-                        except Exception:
-                            continue
-            except Exception as e:
-                print(f"[WARN] Failed to process radio {radio_idx+1}: {e}")
+        if field["value"]:
+            log.debug("FIELD %s already filled with: %s", num, field['value'])
+            continue
+        
+        if field["tag"] == "select":
+            options = [
+                opt["text"] for opt in field["options"]
+                if opt["value"] and opt["text"] and opt["text"].lower() not in PLACEHOLDER_OPTIONS
+            ]
+            if options:
+                log.debug("SELECT %s: %s options: %s", num, question["q"], options)
+                pending.append({"kind": "select", "field": field, "options": options, **question})
+        
+        elif (field["type"] == "number"
+              or "whole number" in field["error"].lower()
+              or "number" in field["placeholder"].lower()):
+            log.debug("NUMBER %s: %s", num, question["q"])
+            if any(word in ql for word in NUMERIC_ZERO_WORDS):
+                log.debug("Using default '0' for number field")
+                fills.append((field["idx"], "0"))
+            else:
+                pending.append({"kind": "number", "field": field, **question})
+        
+        else:
+            log.debug("TEXT %s: %s", num, question["q"])
+            mapped = match_answer_map(ql)
+            if mapped:
+                key, val = mapped
+                log.debug("Using mapped answer for '%s': %s", key, val)
+                fills.append((field["idx"], val))
+            else:
+                pending.append({"kind": "text", "field": field, **question})
     
-    except Exception as e:
-        print(f"[WARN] Failed to process radios: {e}")
+    for name, group in radio_groups.items():
+        if any(radio["checked"] for radio in group):
+            log.debug("RADIO group '%s' already has selection", name)
+            continue
+        labels = [radio["label"] or radio["value"] for radio in group if radio["label"] or radio["value"]]
+        if labels:
+            question = question_for(group[0]["legend"])
+            log.debug("RADIO group '%s': %s options: %s", name, question["q"], labels)
+            pending.append({"kind": "radio", "field": group, "options": labels, **question})
     
-    try:
-        numbers = section.locator("input[type=number]")
-        for num_idx in range(numbers.count()):
-            num = numbers.nth(num_idx)
-            try:
-                if not is_field_empty(num):
-                    current_value = num.input_value()
-                    print(f"[DEBUG] NUMBER {num_idx+1} already filled with: {current_value}")
-                    continue
-                
-                label = section.inner_text().strip()
-                print(f"[DEBUG] NUMBER {num_idx+1}: {label}")
-                
-                if any(word in label.lower() for word in ["year", "experience", "salary"]):
-                    ans = "0"
-                    print(f"[DEBUG] Using default '0' for number field")
-                else:
-                    ans = answer_text_with_retry(label)
-                    if not ans.isdigit():
-                        ans = "0"
-                
-                num.fill(ans)
-                did_fill = True
-                print(f"[DEBUG] Filled NUMBER with: {ans}")
-            except Exception as e:
-                print(f"[WARN] Failed to process number {num_idx+1}: {e}")
+    for idx, item in enumerate(pending):
+        item["id"] = str(idx + 1)
+    answers = answer_questions(pending)
     
-    except Exception as e:
-        print(f"[WARN] Failed to process numbers: {e}")
+    for item in pending:
+        ans = answers.get(item["id"], "")
+        kind = item["kind"]
+        if kind == "radio":
+            for radio in item["field"]:
+                radio_label = radio["label"] or radio["value"]
+                if ans == radio_label:
+                    log.debug("Selected RADIO: %s", radio_label)
+                    fills.append((radio["idx"], radio_label))
+                    break
+            continue
+        if kind == "number" and not ans.isdigit():
+            ans = "0"
+        log.debug("Filling %s with: %s", kind.upper(), ans)
+        fills.append((item["field"]["idx"], ans))
     
-    try:
-        texts = section.locator("textarea, input[type=text]")
-        for txt_idx in range(texts.count()):
-            fld = texts.nth(txt_idx)
-            try:
-                if not is_field_empty(fld):
-                    current_value = fld.input_value()
-                    print(f"[DEBUG] TEXT {txt_idx+1} already filled with: {current_value}")
-                    continue
-                
-                label = section.inner_text().strip()
-                lw = label.lower()
-                print(f"[DEBUG] TEXT {txt_idx+1}: {label}")
-                
-                mapped = False
-                for key, val in ANSWER_MAP.items():
-                    if key in lw:
-                        print(f"[DEBUG] Using mapped answer for '{key}': {val}")
-                        fld.fill(val)
-                        mapped = True
-                        did_fill = True
-                        break
-                
-                if not mapped:
-                    ans = answer_text_with_retry(label)
-                    fld.fill(ans)
-                    did_fill = True
-                    print(f"[DEBUG] Filled TEXT with: {ans}")
-            except Exception as e:
-                print(f"[WARN] Failed to process text {txt_idx+1}: {e}")
+    if not fills:
+        return False
     
+    try:
+        return section.evaluate(FILL_FIELDS_JS, fills) > 0
     except Exception as e:
-        print(f"[WARN] Failed to process text fields: {e}")
-    
-    return did_fill
+        log.warning("Failed to fill form fields: %s", e)
+        return False
+
+SECTION_SELECTOR = "section, div.form-section, .artdeco-modal__section"
+SECTION_FALLBACK_SELECTOR = "form > div, fieldset, [data-test-form-element], .fb-dash-form-element"
+
+# Modal header keywords that pick the page handler
+CONTACT_HEADER_WORDS = ("contact info", "resume", "cv")
+QUESTION_HEADER_WORDS = ("question", "education", "work", "additional", "experience")
+
+CANCEL_SELECTOR = ", ".join([
+    "button:has-text('Cancel')",
+    "button:has-text('Dismiss')",
+    "button:has-text('Close')",
+    "button[aria-label*='Close']",
+    ".artdeco-modal__dismiss",
+])
 
 def process_modal_with_timeout(page: Page, modal: Locator, max_duration: int = 300) -> bool:
     """Process modal with timeout and duplicate state detection"""
     start_time = time.monotonic()
-    seen_states: Set[str] = set()
+    state_counts: Dict[str, int] = {}
     loop_count = 0
     max_loops = 20
     
@@ -483,91 +782,89 @@ def process_modal_with_timeout(page: Page, modal: Locator, max_duration: int = 3
         
         try:
             if not modal.is_visible():
-                print("[DEBUG] Modal no longer visible, breaking")
+                log.debug("Modal no longer visible, breaking")
                 break
             
-            current_state = get_modal_state(modal)
-            if current_state in seen_states:
-                logging.warning(f"Duplicate modal state detected: {current_state}")
+            snapshot = get_modal_snapshot(modal)
+            current_state = get_modal_state(modal, snapshot)
+            state_counts[current_state] = state_counts.get(current_state, 0) + 1
+            if state_counts[current_state] > MAX_STATE_REPEATS:
+                log.warning(f"Duplicate modal state detected: {current_state}")
                 break
-            seen_states.add(current_state)
             
-            header_elements = modal.locator("h1, h2, h3, h4")
-            header_text = ""
-            if header_elements.count() > 0:
-                header_text = header_elements.first.inner_text().strip().lower()
+            header_text = snapshot["header"].lower()
             
-            print(f"[DEBUG] Modal state {loop_count}: {header_text}")
+            log.debug("Modal state %s: %s", loop_count, header_text)
             
-            if any(keyword in header_text for keyword in ["contact info", "resume", "cv"]):
-                print("[DEBUG] Contact/Resume page - clicking next")
+            if any(keyword in header_text for keyword in CONTACT_HEADER_WORDS):
+                log.debug("Contact/Resume page - clicking next")
                 nav_btn, btn_type = find_navigation_button(modal)
                 if nav_btn and btn_type in ["next", "review"]:
                     nav_btn.click()
-                    human_pause(1, 2)
+                    wait_for_modal_change(page, modal, current_state)
                     continue
                 else:
-                    print("[DEBUG] No navigation button found on contact/resume page")
+                    log.debug("No navigation button found on contact/resume page")
                     break
             
-            elif any(keyword in header_text for keyword in ["question", "education", "work", "additional", "experience"]):
-                print("[DEBUG] Questions page - processing fields")
-                sections = modal.locator("section, div.form-section, .artdeco-modal__section")
+            elif any(keyword in header_text for keyword in QUESTION_HEADER_WORDS):
+                log.debug("Questions page - processing fields")
+                sections = modal.locator(SECTION_SELECTOR).all()
                 
-                if sections.count() == 0:
-                    sections = modal.locator("div").filter(has_text="")
+                if not sections:
+                    sections = modal.locator(SECTION_FALLBACK_SELECTOR).all()
+                if not sections:
+                    log.debug("No form sections found on questions page")
                 
                 fields_processed = False
-                for j in range(min(sections.count(), 10)):
-                    section = sections.nth(j)
+                consecutive_empty = 0
+                for j, section in enumerate(sections[:10]):
                     try:
                         section_text = section.inner_text().strip()
                         if len(section_text) > 10:
-                            print(f"[DEBUG] Processing section {j+1}/{sections.count()}")
-                            if process_form_fields(section):
+                            # Sections Next left in the DOM come back already filled; process_form_fields skips them in its one extract
+                            log.debug("Processing section %s/%s", j + 1, len(sections))
+                            if process_form_fields(section, section_text):
                                 fields_processed = True
+                                consecutive_empty = 0
+                            elif fields_processed:
+                                # Questions sit at the top of the form; two empty sections after them means we're done
+                                consecutive_empty += 1
+                                if consecutive_empty >= 2:
+                                    log.debug("No more fillable sections, stopping scan")
+                                    break
                     except Exception as e:
-                        print(f"[WARN] Failed to process section {j+1}: {e}")
+                        log.warning("Failed to process section %s: %s", j + 1, e)
                 
                 nav_btn, btn_type = find_navigation_button(modal)
                 if nav_btn:
-                    print(f"[DEBUG] Clicking {btn_type} after processing fields")
+                    log.debug("Clicking %s after processing fields", btn_type)
                     nav_btn.click()
-                    human_pause(1, 2)
+                    wait_for_modal_change(page, modal, current_state)
                     if btn_type == "submit":
                         return True
                 else:
-                    print("[DEBUG] No navigation button found after processing fields")
+                    log.debug("No navigation button found after processing fields")
                     break
             
             else:
                 nav_btn, btn_type = find_navigation_button(modal)
                 if nav_btn:
-                    print(f"[DEBUG] Found {btn_type} button on unknown page")
+                    log.debug("Found %s button on unknown page", btn_type)
                     nav_btn.click()
-                    human_pause(1, 2)
+                    wait_for_modal_change(page, modal, current_state)
                     if btn_type == "submit":
                         return True
                 else:
-                    print("[DEBUG] No navigation options found, attempting to close modal")
-                    cancel_selectors = [
-                        "button:has-text('Cancel')",
-                        "button:has-text('Dismiss')",
-                        "button:has-text('Close')",
-                        "button[aria-label*='Close']",
-                        ".artdeco-modal__dismiss"
-                    ]
-                    
+                    log.debug("No navigation options found, attempting to close modal")
                     closed = False
-                    for selector in cancel_selectors:
-                        try:
-                            cancel_btn = modal.locator(selector).first
-                            if cancel_btn.is_visible():
-                                cancel_btn.click()
-                                closed = True
-                                break
-                        except Exception:
-                            continue
+                    try:
+                        cancel_btn = modal.locator(f"{CANCEL_SELECTOR} >> visible=true").first
+                        if cancel_btn.count():
+                            cancel_btn.click()
+                            closed = True
+                    except Exception:
+                        pass
                     
                     if not closed:
                         try:
@@ -577,237 +874,387 @@ def process_modal_with_timeout(page: Page, modal: Locator, max_duration: int = 3
                     break
         
         except Exception as e:
-            logging.error(f"Error in modal processing loop {loop_count}: {e}")
+            log.error(f"Error in modal processing loop {loop_count}: {e}")
             break
     
     if loop_count >= max_loops:
-        logging.warning(f"Modal processing exceeded max loops ({max_loops})")
+        log.warning(f"Modal processing exceeded max loops ({max_loops})")
     
     if time.monotonic() - start_time >= max_duration:
-        logging.warning(f"Modal processing timed out after {max_duration} seconds")
+        log.warning(f"Modal processing timed out after {max_duration} seconds")
     
     return False
 
+LINKEDIN_URL = "https://www.linkedin.com"
 LOGIN_URL = "https://www.linkedin.com/login"
-JOBS_URL = "https://www.linkedin.com/jobs/search/?f_AL=true&keywords=Software%20Engineer%20Intern"
+# f_AL=true limits the search to Easy Apply postings
+JOBS_URL = "https://www.linkedin.com/jobs/search/?" + urlencode({"f_AL": "true", "keywords": JOB_KEYWORDS}, quote_via=quote)
 
 JOB_CARD = "li[data-occludable-job-id], li.job-card-container--clickable, .job-card-container, .jobs-search-results__list-item"
-NOT_NOW = "button:has-text('Not now'), button:has-text('Skip'), button:has-text('Maybe later')"
+MODAL_SELECTOR = "div[role='dialog'], .artdeco-modal"
+
+# Post-apply prompts to dismiss, matched like :has-text (case-insensitive substring)
+NOT_NOW_LABELS = ["not now", "skip", "maybe later"]
+# Finds and clicks the first visible dismiss button in one round trip; :has-text isn't valid in querySelectorAll
+CLICK_NOT_NOW_JS = """
+(labels) => {
+    const button = [...document.querySelectorAll("button")].find(b => {
+        const text = b.innerText.trim().toLowerCase();
+        return b.offsetParent !== null && labels.some(label => text.includes(label));
+    });
+    if (button) button.click();
+    return !!button;
+}
+"""
+
+# Default for every Playwright action; known-slow waits pass their own timeout
+DEFAULT_TIMEOUT_MS = 5000
+# How long to wait for the user to open the Easy Apply modal before skipping the job
+EASY_APPLY_WAIT_MS = 120000
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCKED_HOSTS = ("px.ads.linkedin.com", "doubleclick.net", "google-analytics.com", "googletagmanager.com")
+
+def block_heavy_resources(route):
+    """Abort images, media, fonts and trackers; stylesheets stay so visibility checks keep working"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        route.abort()
+    else:
+        route.continue_()
+
+# Serializes the Easy Apply prompts so several worker windows don't talk over each other
+PROMPT_LOCK = threading.Lock()
+RESULTS_LOCK = threading.Lock()
+
+def open_page(browser, storage_state=None) -> Page:
+    """Open a page in a fresh browser context with heavy resources blocked"""
+    context = browser.new_context(storage_state=storage_state)
+    context.route("**/*", block_heavy_resources)
+    page = context.new_page()
+    page.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    return page
+
+def is_login_url(url: str) -> bool:
+    """True when LinkedIn bounced us to a sign-in or checkpoint page"""
+    return any(part in url for part in ["/login", "/authwall", "/checkpoint", "/uas/"])
+
+def login(page: Page):
+    from playwright.sync_api import TimeoutError as PWTimeout
+    
+    log.info("▶ Logging into LinkedIn…")
+    page.goto(LOGIN_URL, wait_until="domcontentloaded", timeout=15000)
+    page.fill("input#username", EMAIL)
+    page.fill("input#password", PASSWORD)
+    page.click("button[type='submit']")
+    
+    try:
+        page.wait_for_url("**/feed/**", wait_until="domcontentloaded", timeout=15000)
+    except PWTimeout:
+        print("🔒 Manual intervention may be required (checkpoint/captcha)")
+        try:
+            page.wait_for_url("**/feed/**", wait_until="domcontentloaded", timeout=60000)
+        except PWTimeout:
+            input("🔒 Complete LinkedIn checkpoint manually, then press ENTER…")
+    
+    page.wait_for_selector("div.feed-outlet, .global-nav", timeout=60000)
+    log.info("✅ Logged in successfully.")
+
+def open_jobs_search(page: Page):
+    from playwright.sync_api import TimeoutError as PWTimeout
+    
+    log.info("▶ Loading Easy Apply jobs…")
+    for attempt in range(3):
+        try:
+            page.goto(JOBS_URL, wait_until="domcontentloaded", timeout=15000)
+            break
+        except PWTimeout:
+            if page.locator(JOB_CARD).first.is_visible():
+                log.info("Job cards already visible, continuing without waiting for navigation")
+                break
+            log.warning(f"Navigation attempt {attempt + 1} failed, retrying...")
+            if attempt == 2:
+                raise
+
+SCROLL_CARDS_JS = """
+(sel) => {
+    const cards = document.querySelectorAll(sel);
+    if (cards.length) cards[cards.length - 1].scrollIntoView({block: "end"});
+    else window.scrollTo(0, document.body.scrollHeight);
+    return cards.length;
+}
+"""
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+def load_job_cards(page: Page, target: int) -> int:
+    """Scroll the results list until `target` cards are loaded or the count stops growing"""
+    from playwright.sync_api import TimeoutError as PWTimeout
+    
+    count = page.evaluate(SCROLL_CARDS_JS, JOB_CARD)
+    stalls = 0
+    while count < target and stalls < 2:
+        try:
+            page.wait_for_function(
+                "([sel, n]) => document.querySelectorAll(sel).length > n", arg=[JOB_CARD, count], timeout=1500
+            )
+            stalls = 0
+        except PWTimeout:
+            stalls += 1
+        count = page.evaluate(SCROLL_CARDS_JS, JOB_CARD)
+    return count
+
+TITLE_SELECTORS = ["h3", ".job-card-list__title", "[data-test-id*='title']"]
+COMPANY_SELECTORS = ["h4", ".job-card-container__company-name", "[data-test-id*='company']"]
+
+# Reads every card in one round trip instead of several visibility/text calls per card
+COLLECT_JOBS_JS = """
+([cardSelector, total, titleSelectors, companySelectors]) => {
+    const visible = (el) => !!el && el.getClientRects().length > 0;
+    const pick = (card, selectors, fallback) => {
+        for (const selector of selectors) {
+            const el = card.querySelector(selector);
+            if (visible(el)) return el.innerText.trim();
+        }
+        return fallback;
+    };
+    return [...document.querySelectorAll(cardSelector)].slice(0, total).map((card) => {
+        const link = card.querySelector("a[href*='/jobs/view/']");
+        return {
+            title: pick(card, titleSelectors, "hidden title"),
+            company: pick(card, companySelectors, "hidden company"),
+            href: link ? link.getAttribute("href") || "" : "",
+        };
+    });
+}
+"""
+
+def collect_jobs(page: Page, total: int) -> List[Dict]:
+    """Read title, company and link for the first `total` job cards on the search page"""
+    cards = page.evaluate(COLLECT_JOBS_JS, [JOB_CARD, total, TITLE_SELECTORS, COMPANY_SELECTORS])
+    return [
+        {
+            "num": i + 1,
+            "title": card["title"],
+            "company": card["company"],
+            "link": urljoin(LINKEDIN_URL, card["href"]) if card["href"] else "",
+        }
+        for i, card in enumerate(cards)
+    ]
+
+def job_link_key(link: str) -> str:
+    """Absolute job URL without tracking parameters, so the same posting compares equal across searches
+    (older CSV rows hold relative /jobs/view/... hrefs)"""
+    if not link:
+        return ""
+    return urljoin(LINKEDIN_URL, link).split("?", 1)[0].rstrip("/")
+
+def load_applied_links(path: str) -> Set[str]:
+    """Links already recorded in the applications CSV (read once per run); incomplete ones stay eligible"""
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            return {
+                job_link_key(row["Link"]) for row in csv.DictReader(f)
+                if row.get("Link") and row.get("Status") != "Incomplete"
+            }
+    except FileNotFoundError:
+        return set()
+    except (OSError, csv.Error) as e:
+        log.warning(f"Could not read previous applications from {path}: {e}")
+        return set()
+
+def load_new_jobs(page: Page, applied: Set[str], wanted: int) -> Tuple[int, List[Dict]]:
+    """Keep loading cards until `wanted` linked ones are not in `applied` or the list stops growing"""
+    target = wanted
+    while True:
+        count = load_job_cards(page, target)
+        # Promoted/occluded cards have no /jobs/view/ link and apply_to_job would skip them, so they don't count
+        new_jobs = [
+            job for job in collect_jobs(page, count)
+            if job["link"] and job_link_key(job["link"]) not in applied
+        ]
+        if len(new_jobs) >= wanted or count < target:
+            return count, new_jobs[:wanted]
+        target = count + wanted - len(new_jobs)
+
+def apply_to_job(page: Page, job: Dict) -> Optional[Dict]:
+    """Open a job, wait for the user to start Easy Apply, then fill the modal; returns the CSV record"""
+    from playwright.sync_api import TimeoutError as PWTimeout
+    
+    title, company, link = job["title"], job["company"], job["link"]
+    
+    if not link:
+        log.warning(f"Job {job['num']} has no link - skipping")
+        return None
+    
+    try:
+        page.goto(link, wait_until="domcontentloaded", timeout=15000)
+    except PWTimeout:
+        log.warning(f"Job page for '{title}' is slow to load, continuing")
+    
+    with PROMPT_LOCK:
+        page.bring_to_front()
+        print(f"\n[JOB {job['num']}] {title} at {company}")
+        print(f"📋 Job URL: {page.url}")
+        print(f"👆 Please manually click the 'Easy Apply' button for this job")
+        print(f"⏳ Filling starts as soon as the modal opens (skipping after {EASY_APPLY_WAIT_MS // 1000}s)...")
+        try:
+            page.wait_for_selector(MODAL_SELECTOR, timeout=EASY_APPLY_WAIT_MS)
+        except PWTimeout:
+            print(f"⏭️ No Easy Apply modal opened for '{title}' - skipping")
+            return None
+
+    try:
+        modal = page.locator(MODAL_SELECTOR).first
+        
+        log.debug("✅ Modal detected! Processing application for: %s", title)
+        start_time = time.monotonic()
+        success = process_modal_with_timeout(page, modal, MODAL_TIMEOUT)
+        
+        if success:
+            log.info(f"✅ Successfully applied to '{title}'")
+        else:
+            log.warning(f"⚠️ Application process incomplete for '{title}'")
+        
+        try:
+            page.evaluate(CLICK_NOT_NOW_JS, NOT_NOW_LABELS)
+        except Exception:
+            pass
+        
+        duration = f"{int(time.monotonic() - start_time)} sec"
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        title_safe = title.replace(",", " -")
+        company_safe = company.replace(",", " -")
+
+        log.info(f"Applied #{job['num']}: {title} at {company} ({duration})")
+        return {
+            "Title": title_safe,
+            "Company": company_safe,
+            "Link": link,
+            "DateApplied": timestamp,
+            "Runtime": duration,
+            "Status": "Success" if success else "Incomplete"
+        }
+        
+    except Exception as e:
+        log.error(f"Error processing application for '{title}': {e}")
+        return None
+
+def process_jobs(page: Page, jobs: "queue.Queue[Dict]", save_record: Callable[[Dict], None]):
+    """Apply to jobs from the shared queue until it is empty, saving each record as it completes"""
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            record = apply_to_job(page, job)
+            if record:
+                save_record(record)
+        except Exception as e:
+            log.error(f"Error processing job {job['num']}: {e}")
+
+def run_worker(jobs: "queue.Queue[Dict]", save_record: Callable[[Dict], None], storage_state: Dict):
+    """Extra worker: its own Playwright instance and logged-in context, fed from the shared queue"""
+    from playwright.sync_api import sync_playwright
+    
+    with sync_playwright() as pw:
+        browser = pw.chromium.launch(headless=False)
+        try:
+            process_jobs(open_page(browser, storage_state), jobs, save_record)
+        finally:
+            browser.close()
 
 def main():
-    logging.info("🔍 Verifying OpenAI status…")
+    from playwright.sync_api import sync_playwright
+    
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s [%(levelname)s] %(message)s")
+    print("Enhanced LinkedIn Easy Apply Bot started")
+    check_env()
+    get_prompt_prefix()
+    _qa_cache.update(load_qa_cache(QA_CACHE_PATH))
+    atexit.register(save_qa_cache)
+    
+    log.info("🔍 Verifying OpenAI status…")
     verify_openai()
 
     results = []
 
     with sync_playwright() as pw:
         browser = pw.chromium.launch(headless=False)
-        page = browser.new_page()
 
-        logging.info("▶ Logging into LinkedIn…")
-        page.goto(LOGIN_URL)
-        page.fill("input#username", EMAIL)
-        page.fill("input#password", PASSWORD)
-        page.click("button[type='submit']")
-        
-        try:
-            page.wait_for_url("**/feed/**", timeout=15000)
-        except PWTimeout:
-            print("🔒 Manual intervention may be required (checkpoint/captcha)")
+        logged_in = False
+        if os.path.isfile(STORAGE_STATE_PATH):
+            log.info("▶ Reusing saved LinkedIn session…")
+            page = None
             try:
-                page.wait_for_url("**/feed/**", timeout=60000)
-            except PWTimeout:
-                input("🔒 Complete LinkedIn checkpoint manually, then press ENTER…")
+                page = open_page(browser, STORAGE_STATE_PATH)
+                open_jobs_search(page)
+                logged_in = not is_login_url(page.url)
+                if not logged_in:
+                    log.info("Saved session expired, logging in again…")
+            except Exception as e:
+                log.warning(f"Could not restore session from {STORAGE_STATE_PATH}: {e}")
+            finally:
+                # A failed restore must not leave its blank window open for the whole run
+                if not logged_in and page is not None:
+                    page.context.close()
         
-        page.wait_for_selector("div.feed-outlet, .global-nav", timeout=60000)
-        logging.info("✅ Logged in successfully.")
-
-        logging.info("▶ Loading Easy Apply jobs…")
-        for attempt in range(3):
-            try:
-                page.goto(JOBS_URL, timeout=15000)
-                break
-            except PWTimeout:
-                logging.warning(f"Navigation attempt {attempt + 1} failed, retrying...")
-                if attempt == 2:
-                    raise
+        if not logged_in:
+            page = open_page(browser)
+            login(page)
+            page.context.storage_state(path=STORAGE_STATE_PATH)
+            open_jobs_search(page)
         
-        page.wait_for_selector(JOB_CARD, timeout=30000)
+        page.wait_for_selector(JOB_CARD, timeout=15000)
 
-        prev_count = 0
-        scroll_attempts = 0
-        max_scroll_attempts = 10
-        
-        while scroll_attempts < max_scroll_attempts:
-            cards = page.locator(JOB_CARD)
-            count = cards.count()
-            
-            if count >= MAX_APPLIES:
-                break
-            
-            if count == prev_count:
-                scroll_attempts += 1
-            else:
-                scroll_attempts = 0
-            
-            prev_count = count
-            
-            if count > 0:
-                cards.nth(count - 1).scroll_into_view_if_needed()
-            else:
-                page.evaluate("window.scrollBy(0, 1000)")
-            
-            human_pause(0.5, 1.0)
-        
-        total = min(count, MAX_APPLIES)
-        logging.info(f"✅ Found {count} jobs; will apply to first {total}.")
+        # Stat the CSV once: it decides both the skip list and whether a header is needed
+        file_exists = os.path.isfile(CSV_PATH)
+        applied = load_applied_links(CSV_PATH) if file_exists else set()
+        count, new_jobs = load_new_jobs(page, applied, MAX_APPLIES)
+        total = len(new_jobs)
+        log.info(f"✅ Found {count} jobs; skipping those already in {CSV_PATH}, will apply to {total}.")
         print(f"\n🤖 MANUAL EASY APPLY MODE")
         print(f"📝 The bot will navigate to each job and pause for you to manually click 'Easy Apply'")
-        print(f"🔄 After you click, the bot will automatically fill out the application form")
+        print(f"🔄 Once the modal opens, the bot will automatically fill out the application form")
         print(f"⚡ This bypasses any Easy Apply button detection issues!")
         print(f"\n" + "="*60)
 
-        for i in range(total):
-            try:
-                cards = page.locator(JOB_CARD)
-                if i >= cards.count():
-                    logging.warning(f"Job card {i+1} no longer available")
-                    continue
-                
-                card = cards.nth(i)
-                
-                title_selectors = ["h3", ".job-card-list__title", "[data-test-id*='title']"]
-                company_selectors = ["h4", ".job-card-container__company-name", "[data-test-id*='company']"]
-                
-                title = "hidden title"
-                for selector in title_selectors:
-                    try:
-                        title_el = card.locator(selector).first
-                        if title_el.is_visible():
-                            title = title_el.inner_text().strip()
-                            break
-                    except Exception:
-                        continue
-                
-                company = "hidden company"
-                for selector in company_selectors:
-                    try:
-                        company_el = card.locator(selector).first
-                        if company_el.is_visible():
-                            company = company_el.inner_text().strip()
-                            break
-                    except Exception:
-                        continue
-                
-                link = ""
-                try:
-                    link_el = card.locator("a[href*='/jobs/view/']").first
-                    link = link_el.get_attribute("href") or ""
-                except Exception:
-                    pass
-                
-                print(f"\n[JOB {i+1}] {title} at {company}")
-                
-                card.click()
-                human_pause(1, 2)
+        jobs: "queue.Queue[Dict]" = queue.Queue()
+        for job in new_jobs:
+            jobs.put(job)
 
-                current_url = page.url
-                print(f"📋 Job URL: {current_url}")
-                print(f"👆 Please manually click the 'Easy Apply' button for this job")
-                print(f"⏳ Press ENTER after you've clicked the Easy Apply button and the modal has opened...")
-                
-                input()
-                
-                print(f"[DEBUG] Waiting for Easy Apply modal to appear...")
-                human_pause(1, 2)
+        # Write each record as soon as it completes so a crash mid-run keeps earlier progress
+        csv_f = open(CSV_PATH, "a", newline="", encoding="utf-8", buffering=1)
+        try:
+            writer = csv.writer(csv_f)
+            if not file_exists:
+                writer.writerow(CSV_FIELDS)
 
-                try:
-                    print(f"[DEBUG] Looking for application modal...")
-                    page.wait_for_selector("div[role='dialog'], .artdeco-modal", timeout=15000)
-                    modal = page.locator("div[role='dialog'], .artdeco-modal").first
-                    
-                    if not modal.is_visible():
-                        print(f"[DEBUG] Modal not visible, trying alternative selectors...")
-                        modal_selectors = [
-                            "div[role='dialog']",
-                            ".artdeco-modal",
-                            ".jobs-easy-apply-modal",
-                            "[data-test-modal]"
-                        ]
-                        
-                        modal_found = False
-                        for selector in modal_selectors:
-                            try:
-                                modal = page.locator(selector).first
-                                if modal.is_visible():
-                                    print(f"[DEBUG] Found modal with selector: {selector}")
-                                    modal_found = True
-                                    break
-                            except Exception:
-                                continue
-                        
-                        if not modal_found:
-                            print(f"❌ No application modal found for '{title}' - skipping")
-                            print(f"💡 Make sure you clicked the Easy Apply button and the modal opened")
-                            continue
-                    
-                    print(f"[DEBUG] ✅ Modal detected! Processing application for: {title}")
-                    start_time = time.monotonic()
-                    success = process_modal_with_timeout(modal, page)
-                    
-                    if success:
-                        logging.info(f"✅ Successfully applied to '{title}'")
-                    else:
-                        logging.warning(f"⚠️ Application process incomplete for '{title}'")
-                    
-                    try:
-                        not_now_buttons = page.locator(NOT_NOW)
-                        if not_now_buttons.count() > 0:
-                            not_now_buttons.first.click()
-                            human_pause(0.5, 1)
-                    except Exception:
-                        pass
-                    
-                    duration = f"{int(time.monotonic() - start_time)} sec"
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-                    title_safe = title.replace(",", " -")
-                    company_safe = company.replace(",", " -")
-
-                    results.append({
-                        "Title": title_safe,
-                        "Company": company_safe,
-                        "Link": link,
-                        "DateApplied": timestamp,
-                        "Runtime": duration,
-                        "Status": "Success" if success else "Incomplete"
-                    })
-                    
-                    logging.info(f"Applied #{i+1}: {title} at {company} ({duration})")
-                    
-                except Exception as e:
-                    logging.error(f"Error processing application for '{title}': {e}")
-                    continue
-                
-                human_pause(1.5, 2.5)
-            
-            except Exception as e:
-                logging.error(f"Error processing job {i+1}: {e}")
-                continue
+            def save_record(record: Dict):
+                with RESULTS_LOCK:
+                    results.append(record)
+                    writer.writerow([record[field] for field in CSV_FIELDS])
+                    csv_f.flush()
 
-        fieldnames = ["Title", "Company", "Link", "DateApplied", "Runtime", "Status"]
-        file_exists = os.path.isfile(CSV_PATH)
-        
-        with open(CSV_PATH, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerows(results)
+            workers = []
+            if WORKERS > 1:
+                storage_state = page.context.storage_state()
+                for n in range(min(WORKERS, total) - 1):
+                    worker = threading.Thread(
+                        target=run_worker, args=(jobs, save_record, storage_state), name=f"worker-{n + 2}", daemon=True
+                    )
+                    worker.start()
+                    workers.append(worker)
+                log.info(f"▶ Started {len(workers)} extra browser workers")
+
+            process_jobs(page, jobs, save_record)
+            for worker in workers:
+                worker.join()
+        finally:
+            csv_f.close()
 
-        logging.info(f"✅ Saved {len(results)} application records to {CSV_PATH}")
+        log.info(f"✅ Saved {len(results)} application records to {CSV_PATH}")
         browser.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,63 +2,15 @@
 Test script for field detection logic without hitting LinkedIn
 """
 
-import time
-from playwright.sync_api import sync_playwright, Locator
-from typing import Optional, List, Tuple, Dict, Set
+import os
+import tempfile
 
-def is_field_empty(field) -> bool:
-    """Check if a field is empty or contains only whitespace"""
-    try:
-        current_value = field.input_value() or ""
-        return current_value.strip() == ""
-    except Exception:
-        return True
+from playwright.sync_api import sync_playwright
 
-def get_smart_fallback(question: str) -> str:
-    """Provide context-aware fallback answers based on question content"""
-    q_lower = question.lower()
-    
-    if any(word in q_lower for word in ["year", "experience", "salary", "number"]):
-        return "0"
-    elif any(word in q_lower for word in ["authorized", "eligible", "legal"]):
-        return "Yes"
-    elif any(word in q_lower for word in ["sponsor", "visa", "h1b"]):
-        return "No"
-    elif any(word in q_lower for word in ["relocate", "move", "willing"]):
-        return "Yes"
-    elif any(word in q_lower for word in ["start", "available", "notice"]):
-        return "Immediately"
-    elif any(word in q_lower for word in ["degree", "education", "university"]):
-        return "Bachelor's Degree"
-    elif any(word in q_lower for word in ["cover letter", "why", "interest"]):
-        return "I am excited about this opportunity and believe my skills align well with the requirements."
-    else:
-        return "Yes"
-
-def get_modal_state(modal) -> str:
-    """Get a string representation of the current modal state for loop detection"""
-    try:
-        header_text = ""
-        headers = modal.locator("h1, h2, h3, h4")
-        if headers.count() > 0:
-            header_text = headers.first.inner_text().strip()
-        
-        button_text = ""
-        buttons = modal.locator("button")
-        if buttons.count() > 0:
-            button_texts = []
-            for i in range(min(buttons.count(), 5)):
-                try:
-                    btn_text = buttons.nth(i).inner_text().strip()
-                    if btn_text:
-                        button_texts.append(btn_text)
-                except Exception:
-                    continue
-            button_text = "|".join(button_texts)
-        
-        return f"{header_text}::{button_text}"
-    except Exception:
-        return "unknown_state"
+from linkedin_easy_apply_improved import (
+    is_field_empty, get_modal_state, match_answer_map,
+    match_option, pick_numbered_option, qa_cache_key, job_link_key, load_applied_links,
+)
 
 def process_form_fields_simple(section) -> bool:
     """Simplified version of form processing for testing"""
@@ -211,7 +163,75 @@ def test_modal_state_detection():
         
         browser.close()
 
+def test_answer_map_matching():
+    """Test the precompiled ANSWER_MAP lookup used before calling GPT"""
+    print("\n🗺️ Testing ANSWER_MAP matching...")
+    
+    cases = {
+        "Are you legally authorized to work in the US?": ("legally authorized to work", "Yes"),
+        "Will you require sponsorship now or in the future?": ("require sponsorship", "No"),
+        "Are you WILLING TO RELOCATE?": ("willing to relocate", "Yes"),
+        "How many years of experience do you have with Python?": ("years of experience", "0"),
+        "What is your favourite programming language?": None,
+    }
+    for question, expected in cases.items():
+        result = match_answer_map(question)
+        print(f"{question!r} -> {result} {'✅' if result == expected else '❌'}")
+        assert result == expected, f"{question!r}: expected {expected}, got {result}"
+
+def test_option_matching():
+    """Test mapping GPT replies onto select/radio options"""
+    print("\n🎯 Testing option matching...")
+    
+    years = ["1-2 years", "3-5 years", "6+ years"]
+    assert pick_numbered_option("2", years) == "3-5 years"
+    assert pick_numbered_option(" 3. ", years) == "6+ years"
+    assert pick_numbered_option("3-5 years", years) == "3-5 years"
+    assert pick_numbered_option("9", years) is None
+    assert pick_numbered_option("", years) is None
+    
+    assert match_option("10", ["1", "5", "10"]) == "10"
+    assert match_option("No", ["Not applicable", "No", "Yes"]) == "No"
+    assert match_option("yes", ["Yes", "No"]) == "Yes"
+    assert match_option("Bachelors", ["Bachelor's Degree", "Master's Degree"]) == "Bachelor's Degree"
+    assert match_option("", ["Yes", "No"]) is None
+    print("✅ Option matching works")
+
+def test_qa_cache_key():
+    """Test that cache keys ignore formatting but not the options offered"""
+    print("\n🔑 Testing Q&A cache keys...")
+    
+    assert qa_cache_key("Years of  Python\nexperience?") == qa_cache_key("years of python experience?")
+    assert qa_cache_key("Degree?", ["BS", "MS"]) == qa_cache_key("Degree?", ["MS", "BS"])
+    assert qa_cache_key("Degree?", ["BS", "MS"]) != qa_cache_key("Degree?", ["BS", "PhD"])
+    assert qa_cache_key("Degree?") != qa_cache_key("Degree?", [])
+    print("✅ Cache keys work")
+
+def test_applied_links():
+    """Test job link normalization and reading previous applications from the CSV"""
+    print("\n🔗 Testing applied job links...")
+    
+    key = "https://www.linkedin.com/jobs/view/123"
+    assert job_link_key("/jobs/view/123/?refId=abc") == key
+    assert job_link_key("https://www.linkedin.com/jobs/view/123/") == key
+    assert job_link_key("") == ""
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "applications.csv")
+        assert load_applied_links(path) == set()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.write("Title,Link,Status\n")
+            f.write("A,/jobs/view/123/?trk=x,Applied\n")
+            f.write("B,https://www.linkedin.com/jobs/view/456/,Incomplete\n")
+            f.write("C,,Applied\n")
+        assert load_applied_links(path) == {key}
+    print("✅ Applied links work")
+
 if __name__ == "__main__":
+    test_answer_map_matching()
+    test_option_matching()
+    test_qa_cache_key()
+    test_applied_links()
     test_field_detection()
     test_modal_state_detection()
     print("\n🎉 All tests completed!")